@@ -0,0 +1,281 @@
+# annotation_cache.py
+import hashlib
+import json
+import mmap
+import os
+import struct
+import numpy as np
+from dataset import CATEGORY_ID_FIELDS, CATEGORY_KEYS, MISSING_ID, AnnotationDataset, _id_or_missing
+from geometry import ImageGeometry
+
+# Dosya düzeni: MAGIC | başlık uzunluğu (uint64) | başlık JSON'u | hizalı diziler.
+# Başlıkta kaynak JSON'un imzası, tip, kategori adları, görsel listesi ve
+# dizilerin (ofset, dtype, şekil) tablosu bulunur.
+MAGIC = b"DXCACHE\x01"
+FORMAT_VERSION = 1
+_ALIGN = 64
+_PREFIX = struct.Struct("<8sQ")
+# MappedAnnotationDataset'in beklediği diziler
+_ARRAY_NAMES = {"image_ids", "ann_image_keys", "ann_image_offsets", "ann_ids", "bboxes",
+                "ann_ring_offsets", "ring_offsets", "coords", *CATEGORY_ID_FIELDS}
+
+
+def cache_dir():
+    """Önbellek klasörü (DENTEX_CACHE_DIR ile değiştirilebilir)."""
+    return os.environ.get("DENTEX_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "dentex")
+
+
+def cache_path_for(json_path: str):
+    """Kaynak JSON'un (mutlak yoluna göre) önbellek dosyası."""
+    key = hashlib.sha1(os.path.abspath(json_path).encode("utf-8")).hexdigest()[:20]
+    return os.path.join(cache_dir(), key + ".dxc")
+
+
+def file_digest(path: str):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _source_signature(json_path: str, st: os.stat_result, digest=None):
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha1": digest or file_digest(json_path)}
+
+
+# ----------------------
+# YAZMA
+# ----------------------
+def write_cache(json_path: str, st: os.stat_result, dataset: AnnotationDataset):
+    """Tam okunmuş veri setini önbellek dosyasına yazar; yazılamazsa False.
+
+    Önce geçici dosyaya yazılıp yerine taşınır; yarım dosya hiç görünmez.
+    Tam sayı olmayan id'ler ya da 4 elemanlı olmayan bbox'lar varsa önbellek atlanır.
+    Önbellekten açılmış (bellek eşlemli) veri seti ham anotasyon tutmadığı için yazılmaz.
+    """
+    if isinstance(dataset, MappedAnnotationDataset):
+        return False
+    image_keys, ann_image_offsets = [], [0]
+    ann_ids, bboxes, cat_cols = [], [], {f: [] for f in CATEGORY_ID_FIELDS}
+    ann_ring_counts, ring_sizes, rings = [], [], []
+    try:
+        for image_id, raws in dataset.iter_raw():
+            image_keys.append(int(image_id))
+            for meta, ann_rings in raws:
+                ann_ids.append(_id_or_missing(meta.get("id"), strict=True))
+                bbox = meta.get("bbox")
+                if bbox and len(bbox) != 4:
+                    return False
+                bboxes.append([float(v) for v in bbox] if bbox else [np.nan] * 4)
+                for f in CATEGORY_ID_FIELDS:
+                    cat_cols[f].append(_id_or_missing(meta.get(f), strict=True))
+                ann_ring_counts.append(len(ann_rings))
+                ring_sizes.extend(len(r) for r in ann_rings)
+                rings.extend(ann_rings)
+            ann_image_offsets.append(len(ann_ids))
+        image_ids = [int(dataset.image_id_by_file[fn]) for fn in dataset.file_names]
+        categories = {key: [[int(k), v] for k, v in dataset.categories[key].items()] for key in CATEGORY_KEYS}
+    except (TypeError, ValueError, OverflowError):
+        return False
+
+    arrays = {
+        "image_ids": np.asarray(image_ids, dtype=np.int64),
+        "ann_image_keys": np.asarray(image_keys, dtype=np.int64),
+        "ann_image_offsets": np.asarray(ann_image_offsets, dtype=np.int64),
+        "ann_ids": np.asarray(ann_ids, dtype=np.int64),
+        "bboxes": np.asarray(bboxes, dtype=np.float64).reshape(-1, 4),
+        "ann_ring_offsets": np.concatenate([[0], np.cumsum(ann_ring_counts, dtype=np.int64)]),
+        "ring_offsets": np.concatenate([[0], np.cumsum(ring_sizes, dtype=np.int64)]),
+        "coords": np.concatenate(rings).astype(np.float32) if rings else np.zeros((0, 2), np.float32),
+    }
+    for f in CATEGORY_ID_FIELDS:
+        arrays[f] = np.asarray(cat_cols[f], dtype=np.int64)
+
+    # Dizi ofsetleri başlığın sonundan itibaren verilir; başlık boyu ofsetlere bağlı olmasın
+    table, offset = {}, 0
+    for name, arr in arrays.items():
+        arrays[name] = arr = np.ascontiguousarray(arr)
+        table[name] = {"offset": offset, "dtype": arr.dtype.str, "shape": list(arr.shape)}
+        offset += -(-arr.nbytes // _ALIGN) * _ALIGN
+    header = json.dumps({
+        "format": FORMAT_VERSION,
+        "source": _source_signature(json_path, st),
+        "json_type": dataset.json_type,
+        "categories": categories,
+        "file_names": dataset.file_names,
+        "arrays": table,
+    }).encode("utf-8")
+    data_start = -(-(_PREFIX.size + len(header)) // _ALIGN) * _ALIGN
+
+    out = cache_path_for(json_path)
+    tmp = f"{out}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+        with open(tmp, "wb") as f:
+            f.write(_PREFIX.pack(MAGIC, len(header)))
+            f.write(header)
+            for name, arr in arrays.items():
+                f.seek(data_start + table[name]["offset"])
+                f.write(arr.tobytes())
+            f.truncate(data_start + offset)
+        os.replace(tmp, out)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+# ----------------------
+# OKUMA
+# ----------------------
+def open_cache(json_path: str, st: os.stat_result):
+    """Kaynakla eşleşen önbellek varsa bellek eşlemli veri seti döner, yoksa None.
+
+    Boyut farklıysa önbellek geçersizdir; sadece mtime değiştiyse içerik
+    özeti (sha1) karşılaştırılır. Kesilmiş ya da bozuk dosya da None döndürür;
+    çağıran JSON'u okuyup önbelleği yeniden yazar.
+    """
+    path = cache_path_for(json_path)
+    try:
+        with open(path, "rb") as f:
+            magic, header_len = _PREFIX.unpack(f.read(_PREFIX.size))
+            if magic != MAGIC:
+                return None
+            header = json.loads(f.read(header_len).decode("utf-8"))
+            if header.get("format") != FORMAT_VERSION:
+                return None
+            src = header["source"]
+            if src["size"] != st.st_size:
+                return None
+            if src["mtime_ns"] != st.st_mtime_ns:
+                if src["sha1"] != file_digest(json_path):
+                    return None
+                # İçerik aynı (touch, git checkout): sonraki açılışlar yeniden özet almasın
+                _refresh_signature(path, header, header_len, st)
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError, KeyError, TypeError, struct.error):
+        return None
+    arrays = _map_arrays(mm, header, header_len)
+    if arrays is not None:
+        try:
+            return MappedAnnotationDataset(header, arrays, mm)
+        except (KeyError, TypeError, ValueError):
+            pass
+    arrays = None
+    try:
+        mm.close()
+    except BufferError:
+        pass  # dizilerden biri hâlâ tamponu tutuyor; çöp toplayıcı kapatır
+    return None
+
+
+def _refresh_signature(path, header, header_len, st):
+    """Başlıktaki kaynak mtime'ını yerinde günceller; diziler taşınmaz.
+
+    Yeni başlık boşlukla eski uzunluğa tamamlanır (JSON sondaki boşluğu yok
+    sayar). Sığmazsa ya da dosya yazılamıyorsa dokunulmaz.
+    """
+    header["source"]["mtime_ns"] = st.st_mtime_ns
+    encoded = json.dumps(header).encode("utf-8")
+    if len(encoded) > header_len:
+        return
+    try:
+        with open(path, "r+b") as f:
+            f.seek(_PREFIX.size)
+            f.write(encoded.ljust(header_len, b" "))
+    except OSError:
+        pass
+
+
+def _map_arrays(mm, header, header_len):
+    """Başlıktaki dizi tablosunu dosyaya eşler; tablo dosyayla uyuşmazsa None.
+
+    Yarım kalmış (kesilmiş) ya da bozuk dosyada hata fırlatılmaz, önbellek
+    yeniden kurulsun diye None döner.
+    """
+    data_start = -(-(_PREFIX.size + header_len) // _ALIGN) * _ALIGN
+    arrays = {}
+    try:
+        for name, info in header["arrays"].items():
+            dtype = np.dtype(info["dtype"])
+            shape = [int(n) for n in info["shape"]]
+            count = int(np.prod(shape, dtype=np.int64))
+            start = data_start + int(info["offset"])
+            if min(shape, default=0) < 0 or start < data_start or start + count * dtype.itemsize > len(mm):
+                return None
+            arrays[name] = np.frombuffer(mm, dtype=dtype, count=count, offset=start).reshape(shape)
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+    if not _ARRAY_NAMES <= arrays.keys():
+        return None
+    return arrays
+
+
+class MappedAnnotationDataset(AnnotationDataset):
+    """Önbellek dosyasından bellek eşlemli okunan veri seti.
+
+    Kategori adları ve görsel listesi başlıktan kurulur; anotasyon sütunları
+    ve köşe dizisi dosyadan eşlenir. Bir görsel istendiğinde sadece onun
+    dilimleri (kopyasız) okunur.
+    """
+
+    def __init__(self, header, arrays, mm):
+        super().__init__(json_type=header["json_type"])
+        self._mm = mm  # dizilerin tamponu; veri seti yaşadıkça açık kalmalı
+        self._arrays = arrays
+        for key in CATEGORY_KEYS:
+            self.add_categories(key, [{"id": k, "name": v} for k, v in header["categories"][key]])
+        self.add_images([{"id": int(i), "file_name": fn}
+                         for i, fn in zip(arrays["image_ids"], header["file_names"])])
+        keys = arrays["ann_image_keys"].tolist()
+        self._ann_slot = dict(zip(keys, range(len(keys))))  # image_id -> ann_image_offsets indeksi
+
+    def _ann_range(self, image_id):
+        slot = self._ann_slot.get(image_id)
+        if slot is None:
+            return 0, 0
+        offsets = self._arrays["ann_image_offsets"]
+        return int(offsets[slot]), int(offsets[slot + 1])
+
+    def revision_for(self, image_id):
+        lo, hi = self._ann_range(image_id)
+        return 0, hi - lo
+
+    def annotation_columns(self):
+        # Sütunlar zaten dosyada; sadece image_id anotasyon başına açılır
+        a = self._arrays
+        cols = {"image_id": np.repeat(a["ann_image_keys"], np.diff(a["ann_image_offsets"])),
+                "bbox": a["bboxes"]}
+        for f in CATEGORY_ID_FIELDS:
+            cols[f] = a[f]
+        return cols
+
+    def _resolve_image(self, image_id):
+        with self._lock:
+            hit = self._resolved.get(image_id)
+            if hit is not None:
+                return hit
+            a = self._arrays
+            lo, hi = self._ann_range(image_id)
+            r0, r1 = int(a["ann_ring_offsets"][lo]), int(a["ann_ring_offsets"][hi])
+            c0, c1 = int(a["ring_offsets"][r0]), int(a["ring_offsets"][r1])
+            geom = ImageGeometry.from_arrays(a["coords"][c0:c1],
+                                             a["ring_offsets"][r0:r1 + 1] - c0,
+                                             a["ann_ring_offsets"][lo:hi + 1] - r0)
+            anns = []
+            for i in range(hi - lo):
+                j = lo + i
+                meta = {"image_id": image_id}
+                if a["ann_ids"][j] != MISSING_ID:
+                    meta["id"] = int(a["ann_ids"][j])
+                if not np.isnan(a["bboxes"][j, 0]):
+                    meta["bbox"] = a["bboxes"][j].tolist()
+                for f in CATEGORY_ID_FIELDS:
+                    if a[f][j] != MISSING_ID:
+                        meta[f] = int(a[f][j])
+                anns.append(self._resolve(meta, i, geom))
+            hit = self._resolved[image_id] = (anns, geom)
+            return hit
@@ -0,0 +1,433 @@
+# benchmark.py
+"""Yükleyici ve görüntüleyicinin sıcak yolları için tekrarlanabilir ölçüm paketi.
+
+Sentetik (COCO biçimli) Quadrant/Enumeration/Disease JSON'ları ve panoramik
+boyutta PNG'ler üretir. Uygulama açılışını, JSON okuma, indeksleme, çizim ve
+katman açma/kapama yollarını penceresiz (QT_QPA_PLATFORM=offscreen) çalıştırır; gecikme
+yüzdeliklerini ve tepe belleği raporlar, kayıtlı temel ölçümle karşılaştırır.
+
+Örnek:
+    python benchmark.py generate --out bench_data --images 20 --anns 32 --vertices 64
+    python benchmark.py run --data bench_data --save-baseline baseline.json
+    python benchmark.py run --data bench_data --baseline baseline.json --tolerance 0.15
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Panoramik röntgenlerin tipik boyutu (piksel)
+PANORAMIC_SIZE = (2880, 1316)
+JSON_FILES = {"Quadrant": "quadrant.json", "Enumeration": "enumeration.json", "Disease": "disease.json"}
+DISEASES = ("Impacted", "Caries", "Periapical Lesion", "Deep Caries")
+PERCENTILES = (50, 90, 99)
+# Temel ölçümden bu oranda (p50) yavaşlayan ölçüm gerileme sayılır
+DEFAULT_TOLERANCE = 0.15
+BASELINE_FORMAT = 1
+
+
+# ----------------------
+# SENTETİK VERİ
+# ----------------------
+def _ring(rng, cx, cy, rx, ry, vertices):
+    """Merkez etrafında hafif pürüzlü kapalı halka (düz [x1, y1, ...] listesi)."""
+    t = np.linspace(0.0, 2.0 * np.pi, vertices, endpoint=False)
+    r = 1.0 + rng.uniform(-0.08, 0.08, vertices)
+    xy = np.column_stack([cx + rx * r * np.cos(t), cy + ry * r * np.sin(t)])
+    return np.round(xy, 2).ravel().tolist()
+
+
+def _annotation(ann_id, image_id, flat, cats):
+    xy = np.asarray(flat).reshape(-1, 2)
+    x0, y0 = xy.min(axis=0)
+    x1, y1 = xy.max(axis=0)
+    a = {"id": ann_id, "image_id": image_id}
+    a.update(cats)
+    a.update({"segmentation": [flat], "bbox": [float(x0), float(y0), float(x1 - x0), float(y1 - y0)],
+              "area": float((x1 - x0) * (y1 - y0)), "iscrowd": 0})
+    return a
+
+
+def _write_image(path, width, height, rng):
+    """Gri tonlu, gürültülü panoramik benzeri PNG yazar."""
+    from PySide6 import QtGui
+    yy, xx = np.mgrid[0:height, 0:width]
+    base = 60 + 80 * np.exp(-(((xx - width / 2) / (width / 2.5)) ** 2 + ((yy - height / 2) / (height / 2)) ** 2))
+    pixels = np.clip(base + rng.normal(0, 12, (height, width)), 0, 255).astype(np.uint8)
+    image = QtGui.QImage(pixels.data, width, height, width, QtGui.QImage.Format_Grayscale8)
+    if not image.save(path, "PNG"):
+        raise OSError(f"PNG yazılamadı: {path}")
+
+
+def generate(out_dir, images=20, anns=32, vertices=64, size=PANORAMIC_SIZE, seed=0):
+    """Üç tip JSON'u ve ``img/`` altına görselleri üretir; (tip -> JSON yolu) döner.
+
+    Her görselde 4 quadrant, ``anns`` diş (Enumeration) ve ``anns`` hastalıklı
+    diş (Disease) anotasyonu bulunur; her halkada ``vertices`` köşe vardır.
+    """
+    rng = np.random.default_rng(seed)
+    width, height = size
+    img_dir = os.path.join(out_dir, "img")
+    os.makedirs(img_dir, exist_ok=True)
+
+    quads = [{"id": q, "name": str(q + 1)} for q in range(4)]
+    teeth = [{"id": t, "name": str(t + 1)} for t in range(8)]
+    diseases = [{"id": d, "name": name} for d, name in enumerate(DISEASES)]
+    image_list = [{"id": i + 1, "file_name": f"bench_{i:04d}.png", "width": width, "height": height}
+                  for i in range(images)]
+    docs = {
+        "Quadrant": {"images": image_list, "categories": quads, "annotations": []},
+        "Enumeration": {"images": image_list, "categories_1": quads, "categories_2": teeth, "annotations": []},
+        "Disease": {"images": image_list, "categories_1": quads, "categories_2": teeth,
+                    "categories_3": diseases, "annotations": []},
+    }
+
+    ann_id = 1
+    per_quad = max(1, -(-anns // 4))
+    for im in image_list:
+        image_id = im["id"]
+        _write_image(os.path.join(img_dir, im["file_name"]), width, height, rng)
+        for q in range(4):
+            qx = width * (0.25 + 0.5 * (q % 2))
+            qy = height * (0.3 + 0.4 * (q // 2))
+            docs["Quadrant"]["annotations"].append(
+                _annotation(ann_id, image_id, _ring(rng, qx, qy, width * 0.22, height * 0.18, vertices),
+                            {"category_id": q}))
+            ann_id += 1
+        for k in range(anns):
+            q, slot = k // per_quad % 4, k % per_quad
+            cx = width * (0.05 + 0.45 * (q % 2)) + (slot + 0.5) * width * 0.45 / per_quad
+            cy = height * (0.3 + 0.4 * (q // 2))
+            rx, ry = width * 0.2 / per_quad, height * 0.12
+            t = slot % len(teeth)
+            flat = _ring(rng, cx, cy, rx, ry, vertices)
+            docs["Enumeration"]["annotations"].append(
+                _annotation(ann_id, image_id, flat, {"category_id_1": q, "category_id_2": t}))
+            ann_id += 1
+            flat = _ring(rng, cx, cy, rx * 0.8, ry * 0.8, vertices)
+            docs["Disease"]["annotations"].append(
+                _annotation(ann_id, image_id, flat, {"category_id_1": q, "category_id_2": t,
+                                                     "category_id_3": int(rng.integers(len(DISEASES)))}))
+            ann_id += 1
+
+    paths = {}
+    for json_type, doc in docs.items():
+        paths[json_type] = os.path.join(out_dir, JSON_FILES[json_type])
+        with open(paths[json_type], "w", encoding="utf-8") as f:
+            json.dump(doc, f)
+    with open(os.path.join(out_dir, "config.json"), "w", encoding="utf-8") as f:
+        json.dump({"images": images, "anns": anns, "vertices": vertices,
+                   "width": width, "height": height, "seed": seed}, f, indent=2)
+    return paths
+
+
+# ----------------------
+# ÖLÇÜM
+# ----------------------
+class Results:
+    """Ölçüm adı -> süre örnekleri (ms) ve aşama sonrası bellek."""
+
+    def __init__(self):
+        self.samples = {}
+        self.rss = {}
+
+    def add(self, name, ms):
+        self.samples.setdefault(name, []).append(ms)
+
+    def timed(self, name, fn, *args):
+        t0 = time.perf_counter()
+        out = fn(*args)
+        self.add(name, (time.perf_counter() - t0) * 1000.0)
+        return out
+
+    def mark_memory(self, stage):
+        from perf import current_rss_bytes
+        self.rss[stage] = current_rss_bytes()
+
+    def summary(self):
+        out = {}
+        for name, values in self.samples.items():
+            arr = np.asarray(values)
+            row = {f"p{p}": float(np.percentile(arr, p)) for p in PERCENTILES}
+            row.update(n=len(values), mean=float(arr.mean()), min=float(arr.min()), max=float(arr.max()))
+            out[name] = row
+        return out
+
+
+def _detect_type_streaming(path):
+    """Tipi stream_dataset'in belirlediği gibi bulur: akışlı okuma ilk kategori
+    anahtarında (anahtarlardan) ya da ilk anotasyonda (alanlarından) durur."""
+    from dataset import CATEGORY_KEYS
+    from dataset_loader import _guess_type_from_annotation, detect_json_type
+    from json_stream import ITEM, KEY_START, iter_top_level
+
+    keys = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for event, key, value in iter_top_level(f):
+            if event == KEY_START:
+                keys[key] = None
+                if key in CATEGORY_KEYS and detect_json_type(keys) is not None:
+                    return detect_json_type(keys)
+            elif event == ITEM and key == "annotations":
+                return _guess_type_from_annotation(value)
+    return detect_json_type(keys)
+
+
+def bench_loader(res, paths, repeat):
+    """JSON tipi tespiti, akışlı okuma ve ikili önbellekten açma."""
+    from dataset_loader import stream_dataset
+    from annotation_cache import open_cache, write_cache
+
+    for json_type, path in paths.items():
+        for _ in range(repeat):
+            res.timed(f"detect_json_type/{json_type}", _detect_type_streaming, path)
+        st = os.stat(path)
+        dataset = None
+        for _ in range(repeat):
+            dataset = res.timed(f"stream_json/{json_type}", stream_dataset, path)
+        res.timed(f"cache_write/{json_type}", write_cache, path, st, dataset)
+        for _ in range(repeat):
+            res.timed(f"cache_open/{json_type}", open_cache, path, st)
+    res.mark_memory("loader")
+
+
+def bench_geometry(res, paths, queries):
+    """Poligon dönüşümü, ızgara indeksi kurulumu ve isabet sorguları (Disease verisi)."""
+    from dataset_loader import load_dataset
+    from geometry import qpolygonf_from_array
+    from spatial_index import AnnotationIndex
+
+    dataset = load_dataset(paths["Disease"])
+    rng = np.random.default_rng(1)
+    for fn in dataset.file_names:
+        image_id = dataset.image_id_for(fn)
+        anns = dataset.annotations_for(image_id)
+        geom = dataset.geometry_for(image_id)
+        rings = [ring for a in anns for ring in a.rings]
+        res.timed("qpolygonf_from_array/image", lambda: [qpolygonf_from_array(r) for r in rings])
+        index = res.timed("index_build", AnnotationIndex, anns, geom)
+        boxes = np.asarray([a.bbox for a in anns if a.bbox])
+        if not len(boxes):
+            continue
+        # Yarısı anotasyon kutularının içinden, yarısı rastgele
+        picks = boxes[rng.integers(len(boxes), size=queries)]
+        xs = np.where(rng.random(queries) < 0.5, picks[:, 0] + picks[:, 2] * rng.random(queries),
+                      rng.uniform(0, PANORAMIC_SIZE[0], queries))
+        ys = np.where(rng.random(queries) < 0.5, picks[:, 1] + picks[:, 3] * rng.random(queries),
+                      rng.uniform(0, PANORAMIC_SIZE[1], queries))
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            res.timed("hit_query", index.at, x, y)
+    res.mark_memory("geometry")
+
+
+def bench_viewer(app, res, data_dir, paths, repeat):
+    """ViewerPage üzerinden vaka yükleme, katman kurma, çizim ve katman açma/kapama."""
+    from PySide6 import QtCore
+    from perf import recorder
+    from viewer_page import ViewerPage
+
+    page = ViewerPage()
+    page.resize(1400, 900)
+    page.show()
+    pool = QtCore.QThreadPool.globalInstance()
+
+    def wait_loaded():
+        for _ in range(6000):
+            app.processEvents()
+            pool.waitForDone(5)
+            app.processEvents()
+            if page._task is None:
+                return
+        raise RuntimeError("Vaka yüklemesi zaman aşımına uğradı")
+
+    def repaint():
+        page.view.viewport().repaint()
+
+    checkboxes = page._layer_checkboxes()
+    for cb in checkboxes.values():
+        cb.setChecked(True)
+    json_paths = list(paths.values())
+    with open(paths["Disease"], "r", encoding="utf-8") as f:
+        file_names = [im["file_name"] for im in json.load(f)["images"]]
+
+    for fn in file_names:
+        image_path = os.path.join(data_dir, "img", fn)
+        t0 = time.perf_counter()
+        page.load_case(image_path, json_paths)
+        wait_loaded()
+        res.add("load_case", (time.perf_counter() - t0) * 1000.0)
+        rec = recorder.get(page._load_token) or {"phases": {}}
+        for phase in ("image_decode", "image_pyramid", "json_load", "show_image", "draw_all"):
+            if phase in rec["phases"]:
+                res.add(f"load_case/{phase}", rec["phases"][phase])
+
+        for _ in range(repeat):
+            # Katmanlar önbellekten atılıp baştan kurulur ve ilk kare çizilir
+            page.drop_cached_layers()
+            res.timed("draw_all/cold", page.draw_all)
+            # İlk karede maske katmanları bitmap'e çizilir
+            res.timed("paint/first_frame", repaint)
+            res.timed("draw_all/warm", page.draw_all)
+            res.timed("paint/fitted", repaint)
+        for key, cb in checkboxes.items():
+            for state in (False, True):
+                t0 = time.perf_counter()
+                cb.setChecked(state)
+                repaint()
+                res.add(f"toggle/{key}", (time.perf_counter() - t0) * 1000.0)
+        page.view.scale(4.0, 4.0)
+        page.view.centerOn(PANORAMIC_SIZE[0] * 0.3, PANORAMIC_SIZE[1] * 0.35)
+        for _ in range(repeat):
+            res.timed("paint/zoomed", repaint)
+    res.mark_memory("viewer")
+    page.close()
+
+
+def bench_startup(res, repeat):
+    """Uygulamanın açılışı: ``main.py --startup-time`` ayrı süreçte çalıştırılır.
+
+    ``startup/first_paint`` main modülünden ilk çizime, ``startup/process``
+    süreç başlatmadan çıkışına kadar geçen süredir.
+    """
+    main_py = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = subprocess.run([sys.executable, main_py, "--startup-time"], env=env,
+                             capture_output=True, text=True, timeout=60)
+        res.add("startup/process", (time.perf_counter() - t0) * 1000.0)
+        try:
+            res.add("startup/first_paint", float(out.stdout.strip().splitlines()[-1]))
+        except (ValueError, IndexError):
+            raise RuntimeError(f"Açılış süresi okunamadı: {out.stderr.strip()[-300:]}")
+
+
+def run(data_dir, repeat=5, queries=2000, skip_viewer=False):
+    """Tüm ölçümleri çalıştırır; rapor sözlüğü döner."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6 import __version__ as pyside_version
+    from PySide6.QtWidgets import QApplication
+    from perf import peak_rss_bytes
+    app = QApplication.instance() or QApplication([])
+
+    with open(os.path.join(data_dir, "config.json"), "r", encoding="utf-8") as f:
+        config = json.load(f)
+    config.update(repeat=repeat, queries=queries)
+    paths = {t: os.path.join(data_dir, name) for t, name in JSON_FILES.items()}
+
+    res = Results()
+    res.mark_memory("start")
+    # Ölçüm ikili önbelleği kullanıcının önbelleğine dokunmaz
+    with tempfile.TemporaryDirectory(prefix="dentex_bench_") as cache:
+        os.environ["DENTEX_CACHE_DIR"] = cache
+        bench_startup(res, repeat)
+        bench_loader(res, paths, repeat)
+        bench_geometry(res, paths, queries)
+        if not skip_viewer:
+            bench_viewer(app, res, data_dir, paths, repeat)
+
+    return {
+        "format": BASELINE_FORMAT,
+        "config": config,
+        "environment": {"python": platform.python_version(), "pyside6": pyside_version,
+                        "platform": platform.platform(), "cpus": os.cpu_count()},
+        "results": res.summary(),
+        "memory": {"rss_bytes": res.rss, "peak_rss_bytes": peak_rss_bytes()},
+    }
+
+
+# ----------------------
+# RAPOR / KARŞILAŞTIRMA
+# ----------------------
+def compare(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    """p50 oranlarını döner: [(ad, şimdiki, temel, oran, gerileme mi)]."""
+    rows = []
+    for name, row in report["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None or base["p50"] <= 0:
+            continue
+        ratio = row["p50"] / base["p50"]
+        rows.append((name, row["p50"], base["p50"], ratio, ratio > 1.0 + tolerance))
+    return rows
+
+
+def print_report(report, comparison=None):
+    cmp = {name: (ratio, regressed) for name, _, _, ratio, regressed in comparison or []}
+    cols = "".join(f"{'p' + str(p):>10}" for p in PERCENTILES)
+    print(f"{'ölçüm':<32}{'n':>6}{cols}{'maks':>10}{'temel':>10}")
+    for name, row in sorted(report["results"].items()):
+        line = f"{name:<32}{row['n']:>6}" + "".join(f"{row[f'p{p}']:>10.3f}" for p in PERCENTILES)
+        line += f"{row['max']:>10.3f}"
+        if name in cmp:
+            ratio, regressed = cmp[name]
+            line += f"{ratio:>9.2f}x" + (" GERİLEME" if regressed else "")
+        print(line)
+    mb = 1024 * 1024
+    mem = report["memory"]
+    stages = ", ".join(f"{k}={v / mb:.0f} MB" for k, v in mem["rss_bytes"].items() if v)
+    print(f"Bellek (RSS): {stages}")
+    if mem["peak_rss_bytes"]:
+        print(f"Tepe bellek: {mem['peak_rss_bytes'] / mb:.0f} MB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DENTEX görüntüleyici ölçüm paketi.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="Sentetik veri üretir")
+    gen.add_argument("--out", required=True, help="Çıktı klasörü")
+    gen.add_argument("--images", type=int, default=20, help="Görsel sayısı")
+    gen.add_argument("--anns", type=int, default=32, help="Görsel başına diş/hastalık anotasyonu")
+    gen.add_argument("--vertices", type=int, default=64, help="Halka başına köşe sayısı")
+    gen.add_argument("--width", type=int, default=PANORAMIC_SIZE[0])
+    gen.add_argument("--height", type=int, default=PANORAMIC_SIZE[1])
+    gen.add_argument("--seed", type=int, default=0)
+
+    rn = sub.add_parser("run", help="Ölçümleri çalıştırır")
+    rn.add_argument("--data", required=True, help="generate ile üretilmiş klasör")
+    rn.add_argument("--repeat", type=int, default=5, help="Ölçüm başına tekrar")
+    rn.add_argument("--queries", type=int, default=2000, help="Görsel başına isabet sorgusu")
+    rn.add_argument("--no-viewer", action="store_true", help="ViewerPage ölçümlerini atla")
+    rn.add_argument("--out", help="Raporu JSON olarak yaz")
+    rn.add_argument("--baseline", help="Karşılaştırılacak temel ölçüm dosyası")
+    rn.add_argument("--save-baseline", help="Raporu temel ölçüm olarak kaydet")
+    rn.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                    help="p50'de izin verilen yavaşlama oranı (0.15 = %%15)")
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        t0 = time.perf_counter()
+        paths = generate(args.out, args.images, args.anns, args.vertices, (args.width, args.height), args.seed)
+        sizes = ", ".join(f"{t}={os.path.getsize(p) / 1024 / 1024:.1f} MB" for t, p in paths.items())
+        print(f"Üretildi ({time.perf_counter() - t0:.1f} sn): {args.images} görsel; {sizes}")
+        return 0
+
+    report = run(args.data, args.repeat, args.queries, args.no_viewer)
+    comparison = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("config") != report["config"]:
+            print("Uyarı: temel ölçümün veri/ayar yapılandırması farklı", file=sys.stderr)
+        comparison = compare(report, baseline, args.tolerance)
+    print_report(report, comparison)
+    for target in (args.out, args.save_baseline):
+        if target:
+            with open(target, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+    regressions = [name for name, *_, regressed in comparison or [] if regressed]
+    if regressions:
+        print(f"{len(regressions)} ölçümde gerileme: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+# case_loader.py
+import os
+import threading
+from collections import OrderedDict
+from PySide6 import QtCore, QtGui
+from dataset import DatasetGroup
+from dataset_loader import load_dataset
+from perf import recorder
+from tiled_image import ImagePyramid
+
+
+class CaseLoadSignals(QtCore.QObject):
+    # İlk argüman her zaman görevin token'ı; eski (iptal edilmiş) sonuçlar bununla ayıklanır
+    progress = QtCore.Signal(int, str)                  # token, aşama metni
+    loaded = QtCore.Signal(int, str, object, object)    # token, image_path, ImagePyramid, DatasetGroup
+    partial = QtCore.Signal(int, str, object, object)   # loaded gibi; veri seti henüz okunuyor
+    failed = QtCore.Signal(int, str, str)               # token, başlık, mesaj
+
+
+class CaseLoadTask(QtCore.QRunnable):
+    """Görseli QImage'a çözüp piramidini kurar, JSON'ları akışlı okur; GUI thread'inde çalışmaz.
+
+    QPixmap'e çevirme işi ana thread'de (karo karo, TiledImageItem içinde) yapılır.
+    Birden çok JSON verilebilir (örn. Quadrant + Enumeration + Disease); hepsi
+    tek DatasetGroup olarak yayılır. JSON okunurken görselin anotasyonları
+    geldikçe ``partial`` yayılır. ``image_path`` None ise sadece veri setleri
+    yüklenir (piramit yerine None yayılır).
+    """
+
+    def __init__(self, token: int, image_path, json_paths):
+        super().__init__()
+        self.token = token
+        self.image_path = image_path
+        self.json_paths = [json_paths] if isinstance(json_paths, str) else list(json_paths)
+        self.signals = CaseLoadSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """Görevi iptal eder; devam eden adım biter ama sonuç yayılmaz."""
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def run(self):
+        if self.is_cancelled():
+            return
+        # Önce görsel: büyük JSON okunurken ilk katmanlar yarım veriyle çizilebilsin
+        pyramid = None
+        if self.image_path is not None:
+            self.signals.progress.emit(self.token, "Görsel çözülüyor…")
+            with recorder.phase(self.token, "image_decode"):
+                image = QtGui.QImageReader(self.image_path).read()
+            if self.is_cancelled():
+                return
+            if image.isNull():
+                self.signals.failed.emit(self.token, "Hata", "Görsel yüklenemedi.")
+                return
+            with recorder.phase(self.token, "image_pyramid"):
+                pyramid = ImagePyramid(image)
+            if self.is_cancelled():
+                return
+
+        datasets = []
+
+        def on_progress(dataset):
+            # Görselin kaydı indekslendiyse o ana kadar okunan anotasyonlarla göster
+            if pyramid is not None and not self.is_cancelled() and dataset.image_id_for(self.image_path) is not None:
+                self.signals.partial.emit(self.token, self.image_path, pyramid, DatasetGroup(datasets + [dataset]))
+
+        for json_path in self.json_paths:
+            # Birden çok JSON'da hatanın hangisinde olduğu da yazılsın
+            name = f" ({os.path.basename(json_path)})" if len(self.json_paths) > 1 else ""
+            self.signals.progress.emit(self.token, f"JSON okunuyor{name}…")
+            try:
+                # Önbellekteyse ~0 ms; değilse ikili önbellek (mmap) ya da JSON akışı
+                with recorder.phase(self.token, "json_load"):
+                    dataset = load_dataset(json_path, on_progress)
+            except Exception as e:
+                if not self.is_cancelled():
+                    self.signals.failed.emit(self.token, "JSON Hatası", f"JSON okunamadı{name}:\n{e}")
+                return
+            if self.is_cancelled():
+                return
+            if dataset is None:
+                self.signals.failed.emit(self.token, "Hatalı JSON", f"JSON formatı tanınmadı{name}!")
+                return
+            datasets.append(dataset)
+        self.signals.loaded.emit(self.token, self.image_path or "", pyramid, DatasetGroup(datasets))
+
+
+class ImageDecodeSignals(QtCore.QObject):
+    decoded = QtCore.Signal(str, object)  # image_path, ImagePyramid
+
+
+class ImageDecodeTask(QtCore.QRunnable):
+    """Toplu gezinmede komşu görselleri önceden çözer ve piramitlerini kurar."""
+
+    def __init__(self, image_path: str):
+        super().__init__()
+        self.image_path = image_path
+        self.signals = ImageDecodeSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def run(self):
+        if self._cancelled.is_set():
+            return
+        image = QtGui.QImageReader(self.image_path).read()
+        if self._cancelled.is_set() or image.isNull():
+            return
+        pyramid = ImagePyramid(image)
+        if not self._cancelled.is_set():
+            self.signals.decoded.emit(self.image_path, pyramid)
+
+
+class ImageCache:
+    """Çözülmüş görsel piramitleri için bayt sınırlı LRU önbellek (sadece ana thread'den kullanılır)."""
+
+    def __init__(self, max_bytes=768 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._images = OrderedDict()  # image_path -> ImagePyramid
+        self._total = 0
+
+    def get(self, path: str):
+        image = self._images.get(path)
+        if image is not None:
+            self._images.move_to_end(path)
+        return image
+
+    def put(self, path: str, image: ImagePyramid):
+        old = self._images.pop(path, None)
+        if old is not None:
+            self._total -= old.sizeInBytes()
+        self._images[path] = image
+        self._total += image.sizeInBytes()
+        while self._total > self.max_bytes and len(self._images) > 1:
+            _, evicted = self._images.popitem(last=False)
+            self._total -= evicted.sizeInBytes()
+
+    def __contains__(self, path):
+        return path in self._images
+
+    def clear(self):
+        self._images.clear()
+        self._total = 0
@@ -0,0 +1,234 @@
+# dataset.py
+import os
+import threading
+from collections import defaultdict, namedtuple
+import numpy as np
+from PySide6 import QtGui
+from geometry import ImageGeometry, rings_to_arrays
+
+CATEGORY_KEYS = ("categories", "categories_1", "categories_2", "categories_3")
+# JSON tipleri, genelden ayrıntılıya (sonuncusu etiket ve isabet testi için esas alınır)
+TYPE_ORDER = ("Quadrant", "Enumeration", "Disease")
+# Anotasyonların kategori id alanları ve sütunlarda eksik id için işaret değeri
+CATEGORY_ID_FIELDS = ("category_id", "category_id_1", "category_id_2", "category_id_3")
+MISSING_ID = np.iinfo(np.int64).min
+
+# Hastalık id'si renk haritasında yoksa kullanılan renk
+DEFAULT_DISEASE_COLOR = QtGui.QColor(240, 180, 0)
+
+# Tek anotasyonun çizime hazır hali (isimler, renk ve geometri önceden çözülmüş).
+# rings: (N, 2) NumPy halkaları; centroid: ilk halkanın alan ağırlıklı merkezi (QPointF/None);
+# index: görselin ImageGeometry'sindeki sırası
+Annotation = namedtuple("Annotation", "ann_id bbox rings q_name t_name d_id d_name color centroid area index")
+
+
+def disease_color_map(id2name: dict):
+    """Hastalık adlarına göre tutarlı renk seç (4 hastalık varsayımıyla)."""
+    palette = [
+        QtGui.QColor(220, 20, 60),   # crimson
+        QtGui.QColor(65, 105, 225),  # royal blue
+        QtGui.QColor(50, 205, 50),   # lime green
+        QtGui.QColor(255, 140, 0),   # dark orange
+    ]
+    mapping = {}
+    for i, k in enumerate(sorted(id2name.keys(), key=lambda x: int(x) if isinstance(x, int) else 0)):
+        mapping[k] = palette[i % len(palette)]
+    return mapping
+
+
+class AnnotationDataset:
+    """Yüklenen JSON'un bir kez kurulan indeksi.
+
+    file_name -> image_id ve image_id -> anotasyon eşlemelerini, kategori
+    adlarını ve hastalık renklerini tutar; çizim sadece o anki görselin
+    anotasyonlarına dokunur. Segmentasyonlar eklenirken float32 NumPy
+    dizilerine çevrilir; alan/centroid/bbox görsel ilk istendiğinde toplu
+    hesaplanır (ImageGeometry).
+
+    Akışlı okumada (json_stream) veri parça parça eklenir; okuma sürerken
+    başka thread'ler okuyabilir. Bir görselin çizimi güncel mi,
+    ``revision_for`` ile anlaşılır.
+    """
+
+    def __init__(self, data: dict = None, json_type: str = None):
+        self.json_type = json_type
+        self.categories = {key: {} for key in CATEGORY_KEYS}
+        self.disease_colors = {}
+        self.image_id_by_file = {}
+        self.file_names = []  # JSON'daki sırasıyla görsel dosya adları (toplu gezinme için)
+        self._meta_rev = 0  # tip/kategori değiştikçe artar (isim ve renk çözümü bunlara bağlı)
+        self._raw_by_image = defaultdict(list)  # image_id -> [(segmentation'sız alanlar, halkalar)]
+        self._resolved = {}                      # image_id -> ([Annotation], ImageGeometry)
+        self._lock = threading.RLock()
+
+        if data is not None:
+            for key in CATEGORY_KEYS:
+                if key in data:
+                    self.add_categories(key, data[key])
+            self.add_images(data.get("images", []))
+            self.add_annotations(data.get("annotations", []))
+
+    # ----------------------
+    # EKLEME (tam yükleme veya akışlı okuma)
+    # ----------------------
+    def set_json_type(self, json_type):
+        with self._lock:
+            if json_type != self.json_type:
+                self.json_type = json_type
+                self._resolved.clear()
+                self._meta_rev += 1
+
+    def add_categories(self, key, cats):
+        with self._lock:
+            for c in cats:
+                self.categories[key][c.get("id")] = c.get("name")
+            if key == "categories_3":
+                self.disease_colors = disease_color_map(self.categories["categories_3"])
+            self._resolved.clear()
+            self._meta_rev += 1
+
+    def add_images(self, images):
+        with self._lock:
+            for img in images:
+                self.file_names.append(img.get("file_name"))
+                # Aynı dosya adı birden fazla geçerse ilk kayıt geçerli (eski doğrusal arama gibi)
+                self.image_id_by_file.setdefault(img.get("file_name"), img.get("id"))
+
+    def add_annotations(self, anns):
+        # Dönüşüm kilit dışında yapılır; okuyan (GUI) thread sadece eklemeyi bekler
+        items = [({k: v for k, v in a.items() if k != "segmentation"},
+                  rings_to_arrays(a.get("segmentation"), np.float32)) for a in anns]
+        with self._lock:
+            for meta, rings in items:
+                image_id = meta.get("image_id")
+                self._raw_by_image[image_id].append((meta, rings))
+                self._resolved.pop(image_id, None)
+
+    def iter_raw(self):
+        """(image_id, [(segmentation'sız alanlar, float32 halkalar)]) çiftleri (önbelleğe yazmak için)."""
+        with self._lock:
+            items = [(image_id, list(raws)) for image_id, raws in self._raw_by_image.items()]
+        return iter(items)
+
+    # ----------------------
+    # SORGULAR
+    # ----------------------
+    def _resolve_image(self, image_id):
+        """Görselin anotasyonlarını ve toplu geometrisini (gerekirse kurup) döner."""
+        with self._lock:
+            hit = self._resolved.get(image_id)
+            if hit is None:
+                raws = self._raw_by_image.get(image_id, [])
+                geom = ImageGeometry([rings for _, rings in raws])
+                anns = [self._resolve(meta, i, geom) for i, (meta, _) in enumerate(raws)]
+                hit = self._resolved[image_id] = (anns, geom)
+            return hit
+
+    def _resolve(self, a, index, geom):
+        """Ham anotasyonu isimleri ve rengi çözülmüş Annotation'a çevirir."""
+        cat = self.categories
+        if self.json_type == "Quadrant":
+            q_name = cat["categories"].get(a.get("category_id"))
+        else:
+            q_name = cat["categories_1"].get(a.get("category_id_1"))
+        t_id = a.get("category_id_2")
+        d_id = a.get("category_id_3")
+        t_name = cat["categories_2"].get(t_id) if t_id is not None else None
+        d_name = cat["categories_3"].get(d_id) if d_id is not None else None
+        color = self.disease_colors.get(d_id, DEFAULT_DISEASE_COLOR)
+        rings = [geom.ring(r) for r in geom.ann_rings(index)]
+        return Annotation(a.get("id"), a.get("bbox"), rings, q_name, t_name, d_id, d_name, color,
+                          geom.ann_centroid(index), geom.ann_area(index), index)
+
+    def annotation_columns(self):
+        """Tüm anotasyonların sütunları (istatistik ve arama tabloları için).
+
+        ``image_id`` ve CATEGORY_ID_FIELDS int64 (eksik/tam sayı değilse
+        MISSING_ID), ``bbox`` (n, 4) float64 (eksikse NaN).
+        """
+        with self._lock:
+            metas = [(image_id, meta) for image_id, raws in self._raw_by_image.items() for meta, _ in raws]
+        n = len(metas)
+        cols = {"image_id": np.fromiter((_id_or_missing(i) for i, _ in metas), np.int64, n)}
+        for f in CATEGORY_ID_FIELDS:
+            cols[f] = np.fromiter((_id_or_missing(m.get(f)) for _, m in metas), np.int64, n)
+        bboxes = np.full((n, 4), np.nan)
+        for j, (_, m) in enumerate(metas):
+            bbox = m.get("bbox")
+            if bbox and len(bbox) == 4:
+                bboxes[j] = bbox
+        cols["bbox"] = bboxes
+        return cols
+
+    def revision_for(self, image_id):
+        """Görselin çizimini etkileyen verinin sürümü; değiştiyse katmanlar yeniden kurulmalı."""
+        with self._lock:
+            return self._meta_rev, len(self._raw_by_image.get(image_id, ()))
+
+    def image_id_for(self, filename):
+        """Dosya yolundan (sadece adı kullanılır) image_id döner, yoksa None."""
+        if not filename:
+            return None
+        return self.image_id_by_file.get(os.path.basename(filename))
+
+    def annotations_for(self, image_id):
+        """Verilen görsele ait çözülmüş anotasyon listesi."""
+        return self._resolve_image(image_id)[0]
+
+    def geometry_for(self, image_id):
+        """Görselin toplu geometrisi."""
+        return self._resolve_image(image_id)[1]
+
+
+def _id_or_missing(value, strict=False):
+    """id'yi tam sayıya çevirir (None: MISSING_ID); çevrilemezse MISSING_ID, ``strict`` ise hata."""
+    try:
+        return MISSING_ID if value is None else int(value)
+    except (TypeError, ValueError, OverflowError):
+        if strict:
+            raise
+        return MISSING_ID
+
+
+class DatasetGroup:
+    """Aynı görsellere ait birden çok veri seti (JSON tipi başına bir tane).
+
+    Görseller dosya adıyla eşleştirilir; her katman kendi tipindeki veri
+    setinden çizilir. Veri setleri paylaşılan önbellekten geldiği için her
+    JSON bir kez okunur. Aynı tipte iki JSON seçildiyse sonuncusu geçerlidir.
+    """
+
+    def __init__(self, datasets):
+        self.by_type = {}
+        for d in datasets:
+            if d.json_type is not None:
+                self.by_type[d.json_type] = d
+        self.json_types = [t for t in TYPE_ORDER if t in self.by_type]
+        self.datasets = tuple(self.by_type[t] for t in self.json_types)
+
+    @property
+    def primary(self):
+        """En ayrıntılı veri seti."""
+        return self.datasets[-1] if self.datasets else None
+
+    @property
+    def file_names(self):
+        """Tüm veri setlerindeki görsel adları (ilk görülme sırasıyla, tekrarsız)."""
+        return list(dict.fromkeys(fn for d in self.datasets for fn in d.file_names))
+
+    def dataset_for(self, json_type):
+        """Tipin veri seti; None tip (her tipte çizilen katmanlar) için en ayrıntılısı."""
+        return self.primary if json_type is None else self.by_type.get(json_type)
+
+    def annotations_for(self, json_type, filename):
+        """Tipin veri setinde görselin anotasyonları (tip yüklenmediyse boş)."""
+        d = self.dataset_for(json_type)
+        return d.annotations_for(d.image_id_for(filename)) if d is not None else []
+
+    def geometry_for(self, json_type, filename):
+        d = self.dataset_for(json_type)
+        return d.geometry_for(d.image_id_for(filename)) if d is not None else None
+
+    def revision_for(self, filename):
+        """Görselin tüm veri setlerindeki veri sürümü (bkz. AnnotationDataset.revision_for)."""
+        return tuple(d.revision_for(d.image_id_for(filename)) for d in self.datasets)
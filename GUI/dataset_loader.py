@@ -0,0 +1,156 @@
+# dataset_loader.py
+import os
+import threading
+import time
+from collections import OrderedDict
+from annotation_cache import open_cache, write_cache
+from dataset import CATEGORY_KEYS, AnnotationDataset
+from json_stream import ITEM, KEY_START, iter_top_level
+
+# Akışlı okumada kaç eleman biriktirilip veri setine toplu eklenir
+STREAM_BATCH = 256
+
+
+def detect_json_type(data):
+    """Ayrıştırılmış JSON'un üst seviye anahtarlarından tipini bulur (tanınmazsa None)."""
+    if not isinstance(data, dict):
+        return None
+    if "categories" in data and "categories_1" not in data:
+        return "Quadrant"
+    if "categories_1" in data and "categories_2" in data and "categories_3" not in data:
+        return "Enumeration"
+    if "categories_1" in data and "categories_2" in data and "categories_3" in data:
+        return "Disease"
+    return None
+
+
+def _guess_type_from_annotation(a):
+    """Kategori dizileri henüz gelmediyse tipi ilk anotasyonun alanlarından tahmin eder."""
+    if "category_id_3" in a:
+        return "Disease"
+    if "category_id_2" in a:
+        return "Enumeration"
+    if "category_id" in a:
+        return "Quadrant"
+    return None
+
+
+def stream_dataset(path: str, on_progress=None, interval=0.25):
+    """JSON'u json_stream ile parça parça okuyup AnnotationDataset'i artımlı kurar.
+
+    images/categories* geldikçe indekslenir, segmentasyonlar eleman eleman
+    float32 dizilere çevrilir; bütün belge hiçbir zaman bellekte olmaz.
+    ``on_progress(dataset)`` okuma sürerken en fazla ``interval`` saniyede bir
+    çağrılır. Tip, okuma bitince üst seviye anahtarlardan kesinleşir; tanınmazsa None.
+    """
+    dataset = AnnotationDataset()
+    keys = {}
+    pending_key, pending = None, []
+    last = time.monotonic()
+
+    def flush():
+        if pending_key == "images":
+            dataset.add_images(pending)
+        elif pending_key == "annotations":
+            if dataset.json_type is None and pending:
+                dataset.set_json_type(_guess_type_from_annotation(pending[0]))
+            dataset.add_annotations(pending)
+        elif pending_key in CATEGORY_KEYS:
+            dataset.add_categories(pending_key, pending)
+        pending.clear()
+
+    with open(path, "r", encoding="utf-8") as f:
+        for event, key, value in iter_top_level(f):
+            if event == KEY_START:
+                flush()
+                pending_key = key
+                keys[key] = None
+                # Kategori anahtarları anotasyonlardan önce gelirse tip erkenden belirlenir
+                if key in CATEGORY_KEYS and detect_json_type(keys) is not None:
+                    dataset.set_json_type(detect_json_type(keys))
+            elif event == ITEM:
+                pending.append(value)
+                if len(pending) >= STREAM_BATCH:
+                    flush()
+                    now = time.monotonic()
+                    if on_progress is not None and now - last >= interval:
+                        last = now
+                        on_progress(dataset)
+        flush()
+
+    json_type = detect_json_type(keys)
+    if json_type is None:
+        return None
+    dataset.set_json_type(json_type)
+    return dataset
+
+
+class DatasetCache:
+    """Ayrıştırılmış veri setlerinin (yol, mtime) anahtarlı LRU önbelleği.
+
+    Aynı JSON'dan açılan her görsel için dosya tekrar okunmaz. Bellek
+    sınırı, kaynak dosya boyutları toplamı üzerinden yaklaşık tutulur;
+    en son kullanılan girdi her zaman saklanır.
+    """
+
+    def __init__(self, max_bytes=512 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # (abs_path, mtime_ns) -> (AnnotationDataset, boyut)
+        self._total = 0
+        # Arka plan thread'lerinden de çağrılır: sözlük için tek kilit, aynı dosyanın
+        # eşzamanlı iki kez ayrıştırılmaması için de yol başına bir kilit tutulur
+        self._lock = threading.Lock()
+        self._path_locks = {}
+
+    def get(self, path: str, on_progress=None):
+        """Veri setini önbellekten veya diskten döner; tip tanınmazsa None.
+
+        Diskten okunurken önce annotation_cache'teki ikili önbelleğe bakılır;
+        JSON okunuyorsa ``on_progress`` yarım veri setiyle çağrılır (bkz.
+        stream_dataset). Okuma/ayrıştırma hataları (OSError, ValueError) çağırana iletilir.
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            path_lock = self._path_locks.setdefault(path, threading.Lock())
+
+        with path_lock:
+            st = os.stat(path)
+            key = (path, st.st_mtime_ns)
+            with self._lock:
+                hit = self._entries.get(key)
+                if hit is not None:
+                    self._entries.move_to_end(key)
+                    return hit[0]
+
+            # Önce ikili önbellek (bellek eşlemli); yoksa JSON okunup önbellek yazılır
+            dataset = open_cache(path, st)
+            if dataset is None:
+                dataset = stream_dataset(path, on_progress)
+                if dataset is None:
+                    return None
+                write_cache(path, st, dataset)
+
+            with self._lock:
+                # Aynı dosyanın eski (mtime'ı değişmiş) sürümlerini at
+                for old in [k for k in self._entries if k[0] == path]:
+                    self._total -= self._entries.pop(old)[1]
+                self._entries[key] = (dataset, st.st_size)
+                self._total += st.st_size
+                while self._total > self.max_bytes and len(self._entries) > 1:
+                    _, (_, size) = self._entries.popitem(last=False)
+                    self._total -= size
+            return dataset
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total = 0
+
+
+# Uygulama genelinde paylaşılan önbellek
+_cache = DatasetCache()
+
+
+def load_dataset(path: str, on_progress=None):
+    """Paylaşılan önbellek üzerinden veri setini yükler (bkz. DatasetCache.get)."""
+    return _cache.get(path, on_progress)
@@ -0,0 +1,149 @@
+# geometry.py
+import numpy as np
+import shiboken6
+from PySide6 import QtCore, QtGui
+
+# Bu alandan küçük halkalar dejenere sayılır; centroid köşe ortalamasına düşer
+_EPS_AREA = 1e-9
+
+
+def ring_to_array(flat, dtype=np.float64):
+    """[x1,y1,x2,y2,...] -> (N, 2) dizi (tek sayılı fazlalık atılır)."""
+    arr = np.asarray(flat, dtype=dtype).ravel()
+    return arr[: arr.size // 2 * 2].reshape(-1, 2)
+
+
+def rings_to_arrays(segmentation, dtype=np.float64):
+    """COCO segmentation -> boş olmayan halkaların (N, 2) dizileri."""
+    out = []
+    for ring in segmentation or []:
+        arr = ring_to_array(ring, dtype)
+        if len(arr):
+            out.append(arr)
+    return out
+
+
+def qpolygonf_from_array(xy):
+    """(N, 2) diziden QPolygonF; noktalar tek tek değil, tampona toplu kopyalanır (float64'e çevrilerek)."""
+    n = len(xy)
+    poly = QtGui.QPolygonF()
+    poly.resize(n)
+    if n:
+        buf = shiboken6.VoidPtr(poly.data(), n * 2 * 8, True)
+        np.frombuffer(buf, dtype=np.float64).reshape(n, 2)[:] = xy
+    return poly
+
+
+def rings_to_path(rings):
+    """Halkaları tek QPainterPath'te toplar (her halka ayrı kapalı alt yol)."""
+    path = QtGui.QPainterPath()
+    # Halkalar ayrı parçalar; ayrı ayrı doldurulmuş gibi görünsün (OddEven deliği açardı)
+    path.setFillRule(QtCore.Qt.WindingFill)
+    for ring in rings:
+        path.addPolygon(qpolygonf_from_array(ring))
+        path.closeSubpath()
+    return path
+
+
+def point_in_ring(xy, px: float, py: float):
+    """Nokta kapalı halkanın içinde mi (ışın kesişim sayısı, kenarlar tek seferde)."""
+    if len(xy) < 3:
+        return False
+    x = xy[:, 0]
+    y = xy[:, 1]
+    x2 = np.roll(x, -1)
+    y2 = np.roll(y, -1)
+    crosses = (y > py) != (y2 > py)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_at = x + (x2 - x) * (py - y) / (y2 - y)
+    return bool(np.count_nonzero(crosses & (px < x_at)) % 2)
+
+
+def ring_stats(coords, ring_offsets):
+    """Birleştirilmiş halkalar için alan, alan ağırlıklı centroid ve bbox (vektörel).
+
+    coords: (N, 2) tüm köşeler; ring_offsets: (R+1,) halka başlangıçları (boş halka yok).
+    Dönen: areas (R,), centroids (R, 2), bboxes (R, 4) [x, y, w, h].
+    """
+    r = len(ring_offsets) - 1
+    if r <= 0:
+        return np.zeros(0), np.zeros((0, 2)), np.zeros((0, 4))
+    # float32 saklanan köşelerde çapraz çarpımlar hassasiyet kaybetmesin
+    coords = np.asarray(coords, dtype=np.float64)
+    starts = ring_offsets[:-1]
+    ends = ring_offsets[1:]
+    x = coords[:, 0]
+    y = coords[:, 1]
+
+    # Her köşenin halka içindeki bir sonraki köşesi (son köşe halkanın başına döner)
+    nxt = np.arange(1, len(coords) + 1)
+    nxt[ends - 1] = starts
+    cross = x * y[nxt] - x[nxt] * y
+
+    signed = 0.5 * np.add.reduceat(cross, starts)
+    cx = np.add.reduceat((x + x[nxt]) * cross, starts)
+    cy = np.add.reduceat((y + y[nxt]) * cross, starts)
+    counts = ends - starts
+    mean = np.stack([np.add.reduceat(x, starts), np.add.reduceat(y, starts)], axis=1) / counts[:, None]
+
+    centroids = mean.copy()
+    ok = np.abs(signed) > _EPS_AREA
+    centroids[ok, 0] = cx[ok] / (6.0 * signed[ok])
+    centroids[ok, 1] = cy[ok] / (6.0 * signed[ok])
+
+    mins = np.stack([np.minimum.reduceat(x, starts), np.minimum.reduceat(y, starts)], axis=1)
+    maxs = np.stack([np.maximum.reduceat(x, starts), np.maximum.reduceat(y, starts)], axis=1)
+    bboxes = np.concatenate([mins, maxs - mins], axis=1)
+    return np.abs(signed), centroids, bboxes
+
+
+class ImageGeometry:
+    """Bir görselin tüm segmentasyon halkaları tek dizide ve toplu hesaplanmış ölçüleri.
+
+    coords (N, 2), ring_offsets (R+1,), ann_ring_offsets (A+1,): i. anotasyonun
+    halkaları ``ann_ring_offsets[i]:ann_ring_offsets[i+1]`` aralığındadır.
+    coords saklandığı tipte (genelde float32) tutulur; ölçüler float64 hesaplanır.
+    """
+
+    def __init__(self, rings_per_ann):
+        ring_counts = [len(rings) for rings in rings_per_ann]
+        ann_ring_offsets = np.concatenate([[0], np.cumsum(ring_counts)]).astype(np.int64)
+        flat = [ring for rings in rings_per_ann for ring in rings]
+        sizes = [len(ring) for ring in flat]
+        ring_offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+        coords = np.concatenate(flat) if flat else np.zeros((0, 2), dtype=np.float32)
+        self._init_arrays(coords, ring_offsets, ann_ring_offsets)
+
+    @classmethod
+    def from_arrays(cls, coords, ring_offsets, ann_ring_offsets):
+        """Hazır dizilerden kurar (kopyalamadan; örn. bellek eşlemli önbellek dilimleri).
+
+        Ofsetler 0'dan başlamalı: ring_offsets coords'a, ann_ring_offsets halkalara göre.
+        """
+        self = cls.__new__(cls)
+        self._init_arrays(coords, ring_offsets, ann_ring_offsets)
+        return self
+
+    def _init_arrays(self, coords, ring_offsets, ann_ring_offsets):
+        self.coords = coords
+        self.ring_offsets = ring_offsets
+        self.ann_ring_offsets = ann_ring_offsets
+        self.areas, self.centroids, self.bboxes = ring_stats(coords, ring_offsets)
+
+    def ring(self, r: int):
+        return self.coords[self.ring_offsets[r]:self.ring_offsets[r + 1]]
+
+    def ann_rings(self, i: int):
+        """i. anotasyonun halka indeksleri."""
+        return range(self.ann_ring_offsets[i], self.ann_ring_offsets[i + 1])
+
+    def ann_area(self, i: int):
+        lo, hi = self.ann_ring_offsets[i], self.ann_ring_offsets[i + 1]
+        return float(self.areas[lo:hi].sum())
+
+    def ann_centroid(self, i: int):
+        """İlk halkanın (alan ağırlıklı) centroid'i; halka yoksa None."""
+        lo, hi = self.ann_ring_offsets[i], self.ann_ring_offsets[i + 1]
+        if lo == hi:
+            return None
+        return QtCore.QPointF(*self.centroids[lo])
@@ -0,0 +1,112 @@
+# json_stream.py
+import json
+
+# Elemanları tek tek yayılan üst seviye diziler (geri kalan anahtarların değeri bütün okunur)
+ARRAY_KEYS = ("images", "annotations", "categories", "categories_1", "categories_2", "categories_3")
+
+# Olay türleri
+KEY_START = "key"   # (KEY_START, anahtar, None): üst seviye anahtar ilk kez görüldü
+ITEM = "item"       # (ITEM, anahtar, eleman): ARRAY_KEYS dizilerinden tek eleman
+VALUE = "value"     # (VALUE, anahtar, değer): diğer anahtarların tüm değeri
+
+CHUNK_SIZE = 1024 * 1024
+_WS = " \t\r\n"
+_DELIMS = _WS + ",:]}"
+
+
+class _ChunkReader:
+    """Dosyayı parça parça okuyup json.JSONDecoder.raw_decode ile tek tek değer çözer.
+
+    Tampon sadece o an çözülen değer kadar büyür; bütün belge bellekte tutulmaz.
+    """
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self._f = f
+        self._chunk = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self):
+        # Yarım kalan değer büyükse okuma boyu katlanır; tekrar çözme denemeleri doğrusal kalır
+        data = self._f.read(max(self._chunk, len(self._buf) - self._pos))
+        if not data:
+            self._eof = True
+        self._buf = self._buf[self._pos:] + data
+        self._pos = 0
+
+    def peek(self):
+        """Boşlukları atlayıp sıradaki karakteri döner (dosya bittiyse "")."""
+        while True:
+            buf, pos = self._buf, self._pos
+            n = len(buf)
+            while pos < n and buf[pos] in _WS:
+                pos += 1
+            self._pos = pos
+            if pos < n:
+                return buf[pos]
+            if self._eof:
+                return ""
+            self._fill()
+
+    def expect(self, ch):
+        got = self.peek()
+        if got != ch:
+            raise ValueError(f"JSON akışında '{ch}' bekleniyordu, '{got or 'EOF'}' bulundu")
+        self._pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+                self._fill()  # değer tamponun sonunda yarım kaldı
+                continue
+            # Tampon sınırında kesilen sayı ("1." + "5e3") devam ediyor olabilir: değerin
+            # ardından ayraç gelmediyse daha fazla okunur
+            if not self._eof and (end == len(self._buf) or self._buf[end] not in _DELIMS):
+                self._fill()
+                continue
+            self._pos = end
+            return obj
+
+
+def iter_top_level(f, chunk_size=CHUNK_SIZE):
+    """Üst seviyesi nesne olan bir JSON belgesini olay akışı olarak okur.
+
+    ARRAY_KEYS dizilerinin elemanları tek tek (ITEM), diğer anahtarların değerleri
+    bütün olarak (VALUE) yayılır; her anahtarın önce KEY_START olayı gelir.
+    """
+    r = _ChunkReader(f, chunk_size)
+    r.expect("{")
+    if r.peek() == "}":
+        return
+    while True:
+        key = r.value()
+        if not isinstance(key, str):
+            raise ValueError("JSON akışında anahtar bekleniyordu")
+        r.expect(":")
+        yield KEY_START, key, None
+        if key in ARRAY_KEYS and r.peek() == "[":
+            r.expect("[")
+            if r.peek() == "]":
+                r.expect("]")
+            else:
+                while True:
+                    yield ITEM, key, r.value()
+                    if r.peek() == ",":
+                        r.expect(",")
+                        continue
+                    r.expect("]")
+                    break
+        else:
+            yield VALUE, key, r.value()
+        if r.peek() == ",":
+            r.expect(",")
+            continue
+        r.expect("}")
+        return
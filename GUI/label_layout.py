@@ -0,0 +1,94 @@
+# label_layout.py
+import math
+from collections import defaultdict
+
+# Etiket ile bağlandığı kutu arasındaki boşluk (görsel pikseli)
+LABEL_GAP = 2.0
+# Yerleşmiş etiketlerin tutulduğu ızgara hücresinin kenarı (görsel pikseli)
+LABEL_GRID_CELL = 64.0
+# Aday konumların hepsi çakışırsa kutunun üstünde denenen ek kat sayısı
+LABEL_STACK_TRIES = 3
+
+
+class _RectGrid:
+    """Yerleşmiş dikdörtgenlerin düzgün ızgara indeksi (çakışma sorgusu için)."""
+
+    def __init__(self, cell: float = LABEL_GRID_CELL):
+        self._cell = cell
+        self._cells = defaultdict(list)  # (cx, cy) -> [(x0, y0, x1, y1)]
+
+    def _span(self, x0, y0, x1, y1):
+        c = self._cell
+        for cx in range(math.floor(x0 / c), math.floor(x1 / c) + 1):
+            for cy in range(math.floor(y0 / c), math.floor(y1 / c) + 1):
+                yield cx, cy
+
+    def add(self, rect):
+        for key in self._span(*rect):
+            self._cells[key].append(rect)
+
+    def overlap(self, rect):
+        """Dikdörtgenin yerleşmiş olanlarla toplam kesişim alanı (0: çakışma yok)."""
+        x0, y0, x1, y1 = rect
+        seen, total = set(), 0.0
+        for key in self._span(x0, y0, x1, y1):
+            for other in self._cells.get(key, ()):
+                if other in seen:
+                    continue
+                seen.add(other)
+                w = min(x1, other[2]) - max(x0, other[0])
+                h = min(y1, other[3]) - max(y0, other[1])
+                if w > 0 and h > 0:
+                    total += w * h
+        return total
+
+
+def _candidates(anchor, w, h):
+    """Etiketin (sol-üst) aday konumları, tercih sırasıyla.
+
+    Kutu varsa: üstü (sola/sağa yaslı), altı, içinin sol-üstü, sonra üst üste
+    yığılan katlar. Sadece nokta varsa (centroid): ortası, üstü, altı, sağı, solu.
+    """
+    ax, ay, aw, ah = anchor
+    g = LABEL_GAP
+    if aw > 0 or ah > 0:
+        yield ax, ay - g - h
+        yield ax + aw - w, ay - g - h
+        yield ax, ay + ah + g
+        yield ax + aw - w, ay + ah + g
+        yield ax + g, ay + g
+        for k in range(1, LABEL_STACK_TRIES + 1):
+            yield ax, ay - g - h - k * (h + g)
+    else:
+        yield ax - w / 2, ay - h / 2
+        yield ax - w / 2, ay - g - h
+        yield ax - w / 2, ay + g
+        yield ax + g, ay - h / 2
+        yield ax - g - w, ay - h / 2
+
+
+def place_labels(sizes, anchors):
+    """Etiketleri birbirini örtmeyecek şekilde açgözlü (greedy) yerleştirir.
+
+    ``sizes`` [(w, h)] etiket (arkaplan) boyları, ``anchors`` [(x, y, w, h)]
+    bağlandıkları kutular (sadece nokta için w = h = 0). Etiketler yukarıdan
+    aşağıya sırayla yerleşir; her biri için ilk çakışmasız aday seçilir, hiçbiri
+    boş değilse en az örtüşen aday kullanılır (etiket hiç atılmaz). Sol-üst
+    köşelerin [(x, y)] listesi, girdi sırasıyla döner.
+    """
+    grid = _RectGrid()
+    out = [None] * len(sizes)
+    order = sorted(range(len(sizes)), key=lambda i: (anchors[i][1], anchors[i][0]))
+    for i in order:
+        w, h = sizes[i]
+        best, best_overlap = None, None
+        for x, y in _candidates(anchors[i], w, h):
+            overlap = grid.overlap((x, y, x + w, y + h))
+            if best_overlap is None or overlap < best_overlap:
+                best, best_overlap = (x, y), overlap
+                if overlap == 0.0:
+                    break
+        x, y = best
+        grid.add((x, y, x + w, y + h))
+        out[i] = best
+    return out
@@ -1,16 +1,16 @@
 # loader_page.py
-import json
 from PySide6 import QtCore
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QFileDialog, QMessageBox
 
 class LoaderPage(QWidget):
-    proceed = QtCore.Signal(str, str, str)  # image_path, json_path, json_type
+    proceed = QtCore.Signal(str, object)  # image_path, json_paths (ayrıştırma viewer'da arka planda)
+    proceed_batch = QtCore.Signal(str, object)  # images_dir, json_paths (toplu gezinme)
 
     def __init__(self):
         super().__init__()
         self.image_path = None
-        self.json_path = None
-        self.json_type = None
+        self.images_dir = None
+        self.json_paths = []  # birden çok JSON (Quadrant/Enumeration/Disease) birlikte seçilebilir
 
         self.layout = QVBoxLayout()
         self.layout.addWidget(QLabel("<h2>📁 Fotoğraf ve JSON Yükle</h2>"))
@@ -22,7 +22,7 @@ class LoaderPage(QWidget):
         self.lbl_image = QLabel("Seçilen Fotoğraf: Henüz seçilmedi")
         self.layout.addWidget(self.lbl_image)
 
-        self.btn_json = QPushButton("🧾 JSON Seç (.json)")
+        self.btn_json = QPushButton("🧾 JSON Seç (.json, birden fazla seçilebilir)")
         self.btn_json.clicked.connect(self.select_json)
         self.layout.addWidget(self.btn_json)
 
@@ -33,6 +33,20 @@ class LoaderPage(QWidget):
         self.btn_next.clicked.connect(self.proceed_next)
         self.layout.addWidget(self.btn_next)
 
+        # Toplu gezinme: tek klasör + seçili JSON'lar, görseller arasında ileri/geri
+        self.layout.addWidget(QLabel("<h3>📚 Toplu Gezinme</h3>"))
+
+        self.btn_dir = QPushButton("📂 Görsel Klasörü Seç")
+        self.btn_dir.clicked.connect(self.select_images_dir)
+        self.layout.addWidget(self.btn_dir)
+
+        self.lbl_dir = QLabel("Seçilen Klasör: Henüz seçilmedi")
+        self.layout.addWidget(self.lbl_dir)
+
+        self.btn_batch = QPushButton("➡ Klasörle Devam Et")
+        self.btn_batch.clicked.connect(self.proceed_batch_next)
+        self.layout.addWidget(self.btn_batch)
+
         self.setLayout(self.layout)
 
     def select_image(self):
@@ -41,32 +55,28 @@ class LoaderPage(QWidget):
             self.image_path = path
             self.lbl_image.setText(f"Seçilen Fotoğraf: {path}")
 
-    def select_json(self):
-        path, _ = QFileDialog.getOpenFileName(self, "JSON Dosyası Seç", "", "JSON Files (*.json)")
+    def select_images_dir(self):
+        path = QFileDialog.getExistingDirectory(self, "Görsel Klasörü Seç", "")
         if path:
-            self.json_path = path
-            self.lbl_json.setText(f"Seçilen JSON: {path}")
-
-    def detect_json_type(self):
-        try:
-            with open(self.json_path, 'r') as f:
-                data = json.load(f)
-            if "categories" in data and "categories_1" not in data:
-                return "Quadrant"
-            if "categories_1" in data and "categories_2" in data and "categories_3" not in data:
-                return "Enumeration"
-            if "categories_1" in data and "categories_2" in data and "categories_3" in data:
-                return "Disease"
-        except Exception:
-            return None
+            self.images_dir = path
+            self.lbl_dir.setText(f"Seçilen Klasör: {path}")
+
+    def select_json(self):
+        paths, _ = QFileDialog.getOpenFileNames(self, "JSON Dosyası Seç", "", "JSON Files (*.json)")
+        if paths:
+            self.json_paths = paths
+            self.lbl_json.setText("Seçilen JSON: " + ", ".join(paths))
 
     def proceed_next(self):
-        if not self.image_path or not self.json_path:
+        if not self.image_path or not self.json_paths:
             QMessageBox.warning(self, "Eksik Dosya", "Lütfen fotoğraf ve JSON dosyasını seçin!")
             return
-        self.json_type = self.detect_json_type()
-        if not self.json_type:
-            QMessageBox.warning(self, "Hatalı JSON", "JSON formatı tanınmadı!")
+        # Ana pencereye haber ver; JSON ayrıştırma ve tip tespiti ViewerPage'in
+        # arka plan yükleyicisinde (paylaşılan önbellek üzerinden) yapılır
+        self.proceed.emit(self.image_path, self.json_paths)
+
+    def proceed_batch_next(self):
+        if not self.images_dir or not self.json_paths:
+            QMessageBox.warning(self, "Eksik Dosya", "Lütfen görsel klasörünü ve JSON dosyasını seçin!")
             return
-        # Ana pencereye haber ver
-        self.proceed.emit(self.image_path, self.json_path, self.json_type)
+        self.proceed_batch.emit(self.images_dir, self.json_paths)
@@ -1,14 +1,50 @@
 # main.py
-from PySide6.QtWidgets import QApplication, QMainWindow, QTabWidget, QWidget
+import time
+_START = time.perf_counter()  # açılış süresi ölçümü: süreç bu satırdan sonra ilk çizime kadar
+
+from PySide6 import QtCore
+from PySide6.QtWidgets import QApplication, QMainWindow, QTabWidget, QVBoxLayout, QWidget
+import os
 import sys
-from loader_page import LoaderPage
-from viewer_page import ViewerPage   # ← YENİ
+from loader_page import LoaderPage   # sadece PySide6'ya dayanır; ilk çizimden önce kurulan tek sayfa
+
+# Ağır sayfalar (NumPy, JSON okuyucular, çizim modülleri) ilk kullanımda ya da
+# pencere çizildikten sonra boşta içe aktarılıp kurulur
+
+
+class LazyPage(QWidget):
+    """Sekme yer tutucusu; asıl sayfa ilk gösterildiğinde ya da istendiğinde kurulur."""
+
+    def __init__(self, factory):
+        super().__init__()
+        self._factory = factory
+        self._page = None
+        lay = QVBoxLayout(self)
+        lay.setContentsMargins(0, 0, 0, 0)
+
+    def page(self):
+        if self._page is None:
+            self._page = self._factory()
+            self.layout().addWidget(self._page)
+        return self._page
+
+    def is_built(self):
+        return self._page is not None
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.page()
+
 
 class MainWindow(QMainWindow):
+    first_painted = QtCore.Signal(float)  # süreç başından ilk çizime kadar geçen süre (ms)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Panoramik Etiket Görüntüleyici")
         self.setGeometry(200, 200, 1200, 800)
+        self.startup_ms = None
+        self._search_sources = None  # arama sekmesi kurulmadan seçilen (klasör, JSON'lar)
 
         self.tabs = QTabWidget()
         self.setCentralWidget(self.tabs)
@@ -16,18 +52,74 @@ class MainWindow(QMainWindow):
         self.loader_page = LoaderPage()
         self.tabs.addTab(self.loader_page, "Dosya Yükle")
 
-        self.viewer_page = ViewerPage()
-        self.tabs.addTab(self .viewer_page, "Görüntüle")
+        self.viewer_tab = LazyPage(self._create_viewer_page)
+        self.tabs.addTab(self.viewer_tab, "Görüntüle")
+
+        self.search_tab = LazyPage(self._create_search_page)
+        self.tabs.addTab(self.search_tab, "Ara")
 
         # Bağlantı: Yükleyici 'proceed' yaydığında viewer’a aktar ve sekmeye geç
         self.loader_page.proceed.connect(self.on_proceed)
+        self.loader_page.proceed_batch.connect(self.on_proceed_batch)
+
+        # İlk çizim: açılış süresi kaydedilir, görüntüleyici boşta kurulur
+        self.loader_page.installEventFilter(self)
+
+    # ----------------------
+    # TEMBEL SAYFALAR
+    # ----------------------
+    def _create_viewer_page(self):
+        from viewer_page import ViewerPage
+        return ViewerPage()
+
+    def _create_search_page(self):
+        from search_page import SearchPage
+        page = SearchPage()
+        # Arama sonucundan açılan vaka
+        page.open_case.connect(self.on_proceed)
+        if self._search_sources is not None:
+            page.set_sources(*self._search_sources)
+        return page
+
+    @property
+    def viewer_page(self):
+        return self.viewer_tab.page()
+
+    @property
+    def search_page(self):
+        return self.search_tab.page()
+
+    def eventFilter(self, obj, event):
+        if obj is self.loader_page and event.type() == QtCore.QEvent.Paint and self.startup_ms is None:
+            self.startup_ms = (time.perf_counter() - _START) * 1000.0
+            self.loader_page.removeEventFilter(self)
+            self.statusBar().showMessage(f"Açılış: {self.startup_ms:.0f} ms", 5000)
+            # Olay döngüsü boşalınca: kullanıcı dosya seçerken görüntüleyici hazır olsun
+            QtCore.QTimer.singleShot(0, self.viewer_tab.page)
+            self.first_painted.emit(self.startup_ms)
+        return super().eventFilter(obj, event)
+
+    def _set_search_sources(self, images_dir, json_paths):
+        """Arama sekmesi de aynı JSON'larda arasın (kurulmadıysa kurulunca uygulanır)."""
+        self._search_sources = (images_dir, json_paths)
+        if self.search_tab.is_built():
+            self.search_page.set_sources(images_dir, json_paths)
+
+    def on_proceed(self, image_path: str, json_paths: list):
+        self._set_search_sources(os.path.dirname(image_path), json_paths)
+        self.viewer_page.load_case(image_path, json_paths)
+        self.tabs.setCurrentWidget(self.viewer_tab)
 
-    def on_proceed(self, image_path: str, json_path: str, json_type: str):
-        self.viewer_page.load_case(image_path, json_path, json_type)
-        self.tabs.setCurrentWidget(self.viewer_page)
+    def on_proceed_batch(self, images_dir: str, json_paths: list):
+        self._set_search_sources(images_dir, json_paths)
+        self.viewer_page.load_batch(images_dir, json_paths)
+        self.tabs.setCurrentWidget(self.viewer_tab)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     w = MainWindow()
+    if "--startup-time" in sys.argv:
+        # Ölçüm modu: ilk çizime kadar geçen süreyi (ms) yazıp çık (bkz. benchmark.py)
+        w.first_painted.connect(lambda ms: (print(f"{ms:.1f}", flush=True), app.quit()))
     w.show()
     sys.exit(app.exec())
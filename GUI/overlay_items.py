@@ -0,0 +1,315 @@
+# overlay_items.py
+import math
+from collections import OrderedDict
+import numpy as np
+from PySide6 import QtCore, QtGui, QtWidgets
+from geometry import rings_to_path
+from label_layout import place_labels
+from tiled_image import ImagePyramid
+
+LABEL_FONT_SIZE = 10.0
+LABEL_PAD = 3
+LABEL_TEXT_COLOR = QtGui.QColor(0, 0, 0)            # siyah yazı
+LABEL_BG_COLOR = QtGui.QColor(255, 255, 255, 190)   # beyaz yarı saydam arkaplan
+# Satır yüksekliği ekranda bu boydan (piksel) küçük kalan etiketler (yazı ve arkaplan) çizilmez
+LABEL_MIN_SCREEN_PX = 4.0
+# Bir kez şekillendirilip saklanan etiket metni sayısı (metin + yazı tipi başına)
+LABEL_CACHE_SIZE = 4096
+
+# Şekiller merkezlerine göre bu boyda (görsel pikseli) kutulara ayrılır
+BIN_SIZE = 256
+# Maske katmanı bitmap'inin en fazla piksel sayısı (aşılırsa daha düşük çözünürlükte çizilir)
+MASK_RASTER_MAX_PIXELS = 16 * 1024 * 1024
+# QPainterPath öğesi başına yaklaşık bellek (x, y double + tip); katman boyu tahmini için
+PATH_ELEMENT_BYTES = 24
+
+
+def _color_key(color: QtGui.QColor):
+    return color.rgba()
+
+
+# (metin, yazı tipi anahtarı) -> (QStaticText, QSizeF); katmanlar ve vakalar arasında paylaşılır
+_text_cache = OrderedDict()
+
+
+def shaped_text(text: str, font: QtGui.QFont):
+    """Metnin bir kez yerleşimi yapılmış QStaticText'i ve boyu (LRU önbellekten).
+
+    Kısa etiketler ("Q:1 T:3") görseller arasında tekrar ettiği için her
+    metin yazı tipi başına bir kez ölçülüp şekillendirilir.
+    """
+    key = (text, font.key())
+    hit = _text_cache.get(key)
+    if hit is not None:
+        _text_cache.move_to_end(key)
+        return hit
+    static = QtGui.QStaticText(text)
+    static.setTextFormat(QtCore.Qt.PlainText)
+    static.prepare(QtGui.QTransform(), font)
+    hit = _text_cache[key] = (static, QtGui.QFontMetricsF(font).size(0, text))
+    while len(_text_cache) > LABEL_CACHE_SIZE:
+        _text_cache.popitem(last=False)
+    return hit
+
+
+class _Bin:
+    """Katmanın bir ızgara kutusundaki şekilleri; yollar ilk görünüşte kurulur."""
+
+    __slots__ = ("rect", "rects", "masks", "labels", "paths")
+
+    def __init__(self):
+        self.rect = QtCore.QRectF()  # kutudaki şekillerin (kalem payıyla) kapsayan dikdörtgeni
+        self.rects = {}              # stil anahtarı -> [QRectF]
+        self.masks = {}              # stil anahtarı -> [halka listesi] (henüz yola çevrilmemiş)
+        self.labels = []             # (QStaticText, yazının sol-üstü QPointF, arkaplan QRectF)
+        self.paths = None            # stil anahtarı -> QPainterPath (ilk görünüşte kurulur)
+
+    def grow(self, rect: QtCore.QRectF, pen_w: float):
+        rect = rect.adjusted(-pen_w, -pen_w, pen_w, pen_w)
+        self.rect = self.rect.united(rect) if not self.rect.isNull() else rect
+
+
+class LayerItem(QtWidgets.QGraphicsItem):
+    """Bir katmanın tüm kutu, maske ve etiketlerini tek paint() çağrısında çizen öğe.
+
+    Şekiller BIN_SIZE'lık ızgara kutularına dağıtılır; paint() sadece exposedRect
+    ile kesişen kutuları çizer. Maske yolları bir kutu ilk kez görününce
+    kurulur; görünümden uzaklaşan kutularınki release_outside() ile bırakılır. Böylece yakınlaştırılmış incelemede iş
+    ekrandaki şekil sayısıyla orantılı kalır. Etiket yazıları paylaşılan
+    önbellekten (shaped_text) gelir.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._bins = {}     # (bx, by) -> _Bin
+        self._pens = {}     # stil anahtarı -> QPen
+        self._brushes = {}  # stil anahtarı -> QBrush
+        self._font = QtGui.QFont()
+        self._font.setPointSizeF(LABEL_FONT_SIZE)
+        self._text_h = QtGui.QFontMetricsF(self._font).height()  # görsel pikseli
+        self._bounds = QtCore.QRectF()
+        self._built = 0     # maske yolları kurulmuş kutu sayısı
+        # exposedRect ile sadece görünen kutular çizilsin
+        self.setFlag(QtWidgets.QGraphicsItem.ItemUsesExtendedStyleOption, True)
+
+    # ----------------------
+    # KURULUM
+    # ----------------------
+    def draw_bbox(self, bbox, pen: QtGui.QPen):
+        """[x,y,w,h] dikdörtgeni katmana ekler."""
+        x, y, w, h = bbox
+        key = (_color_key(pen.color()), pen.widthF())
+        self._pens.setdefault(key, QtGui.QPen(pen))
+        rect = QtCore.QRectF(x, y, w, h)
+        b = self._bin_at(rect.center())
+        b.rects.setdefault(key, []).append(rect)
+        self._grow(b, rect, pen.widthF())
+
+    def draw_polygons(self, rings, fill: QtGui.QColor, outline: QtGui.QColor, outline_w=1.5):
+        """(N, 2) halkaları aynı stildeki maskelere ekler (yollar kutu görününce kurulur)."""
+        if not len(rings):
+            return
+        key = (_color_key(fill), _color_key(outline), outline_w)
+        if key not in self._brushes:
+            self._pens[key] = QtGui.QPen(outline, outline_w)
+            self._brushes[key] = QtGui.QBrush(fill)
+        lo = np.min([ring.min(axis=0) for ring in rings], axis=0)
+        hi = np.max([ring.max(axis=0) for ring in rings], axis=0)
+        rect = QtCore.QRectF(float(lo[0]), float(lo[1]), float(hi[0] - lo[0]), float(hi[1] - lo[1]))
+        b = self._bin_at(rect.center())
+        b.masks.setdefault(key, []).append(rings)
+        b.paths = None
+        self._grow(b, rect, outline_w)
+
+    def draw_labels(self, labels):
+        """Kısa metin etiketlerini birbirini örtmeyecek şekilde yerleştirip ekler.
+
+        ``labels`` [(metin, (x, y, w, h))]: etiketin bağlandığı kutu (bbox; sadece
+        centroid varsa w = h = 0). Yerleşim görsel pikselinde bir kez yapılır,
+        yakınlaştırmayla değişmez (bkz. label_layout.place_labels).
+        """
+        shaped = [shaped_text(text, self._font) for text, _ in labels]
+        sizes = [(size.width() + 2 * LABEL_PAD, size.height() + 2 * LABEL_PAD) for _, size in shaped]
+        spots = place_labels(sizes, [anchor for _, anchor in labels])
+        for (static, _), (w, h), (x, y) in zip(shaped, sizes, spots):
+            bg = QtCore.QRectF(x, y, w, h)
+            b = self._bin_at(bg.center())
+            b.labels.append((static, QtCore.QPointF(x + LABEL_PAD, y + LABEL_PAD), bg))
+            self._grow(b, bg, 0.0)
+
+    def _bin_at(self, p: QtCore.QPointF):
+        key = (math.floor(p.x() / BIN_SIZE), math.floor(p.y() / BIN_SIZE))
+        b = self._bins.get(key)
+        if b is None:
+            b = self._bins[key] = _Bin()
+        return b
+
+    def _grow(self, b: _Bin, rect: QtCore.QRectF, pen_w: float):
+        # Katman sahneye eklenmeden önce kurulur; prepareGeometryChange gerekmez
+        b.grow(rect, pen_w)
+        self._bounds = self._bounds.united(b.rect) if not self._bounds.isNull() else QtCore.QRectF(b.rect)
+
+    def _build(self, b: _Bin):
+        """Kutunun maske yollarını (kurulmadıysa) tam detayla kurar."""
+        if b.paths is None:
+            b.paths = {key: rings_to_path([ring for rings in ring_lists for ring in rings])
+                       for key, ring_lists in b.masks.items()}
+            self._built += 1
+
+    def prepare(self, rect: QtCore.QRectF = None):
+        """Verilen alandaki (None: tüm) kutuları önceden kurar; örn. boşta komşu vakalar için."""
+        for b in self._bins.values():
+            if b.masks and (rect is None or b.rect.intersects(rect)):
+                self._build(b)
+
+    def release_outside(self, rect: QtCore.QRectF, scale: float = None):
+        """Alanın (boşsa tüm katmanın) dışında kalan kutuların kurulmuş yollarını bırakır.
+
+        ``scale`` görünümün o anki ölçeğidir (ekran pikseli / görsel pikseli).
+        """
+        if not self._built:
+            return
+        for b in self._bins.values():
+            if b.paths is not None and not b.rect.intersects(rect):
+                b.paths = None
+                self._built -= 1
+
+    def holds_paths(self):
+        """Bırakılabilecek (kurulmuş) maske yolu var mı; kutu/yazı katmanlarında hiç olmaz."""
+        return self._built > 0
+
+    def sizeInBytes(self):
+        """Kurulmuş yolların yaklaşık bellek boyu (halkalar veri setine aittir, sayılmaz)."""
+        return sum(path.elementCount() * PATH_ELEMENT_BYTES
+                   for b in self._bins.values() if b.paths is not None
+                   for path in b.paths.values())
+
+    # ----------------------
+    # QGraphicsItem
+    # ----------------------
+    def boundingRect(self):
+        return self._bounds
+
+    def paint(self, painter, option, widget=None):
+        exposed = option.exposedRect
+        visible = [b for b in self._bins.values() if b.rect.intersects(exposed)]
+        if not visible:
+            return
+
+        for b in visible:
+            if not b.masks:
+                continue
+            self._build(b)
+            for key, path in b.paths.items():
+                painter.setPen(self._pens[key])
+                painter.setBrush(self._brushes[key])
+                painter.drawPath(path)
+
+        painter.setBrush(QtCore.Qt.NoBrush)
+        for b in visible:
+            for key, rects in b.rects.items():
+                painter.setPen(self._pens[key])
+                painter.drawRects(rects)
+
+        # Okunamayacak kadar küçülen etiketler hiç çizilmez (boş arkaplan kutusu kalmasın)
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        labeled = [b for b in visible if b.labels]
+        if labeled and self._text_h * lod >= LABEL_MIN_SCREEN_PX:
+            painter.setPen(QtCore.Qt.NoPen)
+            painter.setBrush(LABEL_BG_COLOR)
+            for b in labeled:
+                painter.drawRects([bg for _, _, bg in b.labels])
+            painter.setFont(self._font)
+            painter.setPen(LABEL_TEXT_COLOR)
+            for b in labeled:
+                for static, pos, _ in b.labels:
+                    painter.drawStaticText(pos, static)
+
+
+class MaskLayerItem(LayerItem):
+    """Maskeleri bitmap'ten, yakınlaştırınca vektör yollardan çizen katman.
+
+    Görsel ölçeğine kadar (ekran pikseli bitmap pikselinden büyük değilken)
+    maskeler bir kez ARGB32 (premultiplied) bitmap'e çizilip tek pixmap olarak
+    gösterilir: yarı saydam dolgular her yeniden çizimde tekrar üçgenlenip
+    karıştırılmaz, uzaklaşınca yarıya inen seviyeleri kullanılır. Bitmap'in
+    ölçeğini aşan yakınlaştırmada kenarlar kaba görünmesin diye LayerItem'ın
+    kutu kutu kurulan vektör yolları çizilir (bkz. LayerItem.release_outside).
+    Katman saydamlığı QGraphicsItem.setOpacity ile verilir (bitmap yeniden çizilmez).
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._raster = None       # ImagePyramid (katman kapsamı, _raster_scale ölçeğinde)
+        self._raster_rect = QtCore.QRectF()
+        self._raster_scale = 1.0
+        self._pixmaps = {}        # seviye -> QPixmap (ilk kullanımda çevrilir)
+
+    def draw_polygons(self, rings, fill, outline, outline_w=1.5):
+        super().draw_polygons(rings, fill, outline, outline_w)
+        self._raster = None
+
+    def _rasterize(self):
+        rect = self.boundingRect().toAlignedRect()
+        self._raster_rect = QtCore.QRectF(rect)
+        w, h = max(1, rect.width()), max(1, rect.height())
+        scale = min(1.0, math.sqrt(MASK_RASTER_MAX_PIXELS / (w * h)))
+        img = QtGui.QImage(max(1, math.ceil(w * scale)), max(1, math.ceil(h * scale)),
+                           QtGui.QImage.Format_ARGB32_Premultiplied)
+        img.fill(QtCore.Qt.transparent)
+        painter = QtGui.QPainter(img)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.scale(scale, scale)
+        painter.translate(-rect.x(), -rect.y())
+        for b in self._bins.values():
+            # Tam detay doğrudan çizilir (kutu yolları kurulmaz); küçültmeyi bitmap piramidi yapar
+            for key, ring_lists in b.masks.items():
+                painter.setPen(self._pens[key])
+                painter.setBrush(self._brushes[key])
+                painter.drawPath(rings_to_path([ring for rings in ring_lists for ring in rings]))
+        painter.end()
+        self._raster_scale = scale
+        self._raster = ImagePyramid(img)
+        self._pixmaps = {}
+
+    def prepare(self, rect: QtCore.QRectF = None):
+        """Bitmap'i önceden çizer (vaka sığdırılmış açılır; vektör yollar gerekmez)."""
+        if self._raster is None and self._bins:
+            self._rasterize()
+
+    def release_outside(self, rect: QtCore.QRectF, scale: float = None):
+        # Bitmap ölçeğine dönüldüyse vektör yolların hiçbiri çizilmez: hepsi bırakılır
+        if scale is not None and scale <= self._raster_scale:
+            rect = QtCore.QRectF()
+        super().release_outside(rect, scale)
+
+    def sizeInBytes(self):
+        """Vektör yollar + bitmap piramidi + ondan çevrilmiş pixmap'ler."""
+        size = super().sizeInBytes()
+        if self._raster is not None:
+            size += self._raster.sizeInBytes()
+        return size + sum(pix.width() * pix.height() * pix.depth() // 8 for pix in self._pixmaps.values())
+
+    def paint(self, painter, option, widget=None):
+        if not self._bins:
+            return
+        if self._raster is None:
+            self._rasterize()
+        # Ekran pikseli / bitmap pikseli oranı; 1'i aşarsa bitmap büyütülmek yerine vektör çizilir
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        if lod > self._raster_scale:
+            super().paint(painter, option, widget)
+            return
+        exposed = option.exposedRect.intersected(self._raster_rect)
+        if exposed.isEmpty():
+            return
+        level = self._raster.level_for(lod / self._raster_scale)
+        pix = self._pixmaps.get(level)
+        if pix is None:
+            pix = self._pixmaps[level] = QtGui.QPixmap.fromImage(self._raster.levels[level])
+        sx = pix.width() / self._raster_rect.width()
+        sy = pix.height() / self._raster_rect.height()
+        source = QtCore.QRectF((exposed.x() - self._raster_rect.x()) * sx,
+                               (exposed.y() - self._raster_rect.y()) * sy,
+                               exposed.width() * sx, exposed.height() * sy)
+        painter.drawPixmap(exposed, pix, source)
@@ -0,0 +1,147 @@
+# perf.py
+import cProfile
+import csv
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Ayarlanırsa draw_all her çağrıda cProfile ile sarılır ve bu klasöre .prof yazılır
+PROFILE_ENV = "DENTEX_PROFILE_DIR"
+# Bellekte tutulan en fazla vaka kaydı (eskiler atılır)
+MAX_RECORDS = 500
+
+
+def current_rss_bytes():
+    """Sürecin o anki bellek kullanımı (RSS); ölçülemezse None.
+
+    Linux'ta /proc'tan okunur; başka yerde tepe değer (bkz. peak_rss_bytes) döner.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return peak_rss_bytes()
+
+
+def peak_rss_bytes():
+    """Sürecin şimdiye kadarki en yüksek RSS'i; ölçülemezse None."""
+    try:
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024  # macOS bayt, Linux KiB verir
+    except (ImportError, OSError):
+        return None
+
+
+class PerfRecorder:
+    """Vaka başına aşama süreleri, sahne öğe sayısı ve bellek kayıtları.
+
+    Kayıtlar yükleme token'ı ile anahtarlanır; arka plan thread'leri de
+    (CaseLoadTask) aynı kayda süre ekleyebilir.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records = {}  # token -> kayıt sözlüğü (ekleme sırasıyla)
+
+    def begin(self, token: int, image_path, json_paths):
+        with self._lock:
+            self._records[token] = {
+                "token": token,
+                "image": os.path.basename(image_path) if image_path else "",
+                "json": [os.path.basename(p) for p in json_paths],
+                "json_bytes": sum(os.path.getsize(p) for p in json_paths if os.path.exists(p)),
+                "started": time.time(),
+                "phases": {},
+            }
+            while len(self._records) > MAX_RECORDS:
+                self._records.pop(next(iter(self._records)))
+
+    def add(self, token: int, phase: str, ms: float):
+        """Aşama süresini kayda ekler (aynı aşama tekrarlanırsa toplanır)."""
+        with self._lock:
+            rec = self._records.get(token)
+            if rec is not None:
+                rec["phases"][phase] = rec["phases"].get(phase, 0.0) + ms
+
+    def peak(self, token: int, phase: str, ms: float):
+        """Aşamanın en büyük değerini tutar (örn. en yavaş çizim karesi)."""
+        with self._lock:
+            rec = self._records.get(token)
+            if rec is not None:
+                rec["phases"][phase] = max(rec["phases"].get(phase, 0.0), ms)
+
+    def set(self, token: int, **values):
+        with self._lock:
+            rec = self._records.get(token)
+            if rec is not None:
+                rec.update(values)
+
+    @contextmanager
+    def phase(self, token: int, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(token, name, (time.perf_counter() - t0) * 1000.0)
+
+    def get(self, token: int):
+        with self._lock:
+            rec = self._records.get(token)
+            return None if rec is None else dict(rec, phases=dict(rec["phases"]))
+
+    def records(self):
+        with self._lock:
+            return [dict(r, phases=dict(r["phases"])) for r in self._records.values()]
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    # ----------------------
+    # DIŞA AKTARMA
+    # ----------------------
+    def export_json(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.records(), f, indent=2, ensure_ascii=False)
+
+    def export_csv(self, path: str):
+        """Vaka başına bir satır; her aşama ayrı sütun (ms)."""
+        records = self.records()
+        phases = list(dict.fromkeys(p for r in records for p in r["phases"]))
+        fields = ["token", "image", "json", "json_bytes", "items", "rss_bytes"]
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(fields + [f"{p}_ms" for p in phases])
+            for r in records:
+                row = [r.get("token"), r.get("image"), ";".join(r.get("json", [])), r.get("json_bytes"),
+                       r.get("items"), r.get("rss_bytes")]
+                writer.writerow(row + [round(r["phases"][p], 3) if p in r["phases"] else "" for p in phases])
+
+
+# Uygulama genelinde paylaşılan kayıtçı
+recorder = PerfRecorder()
+
+_profile_count = 0
+
+
+@contextmanager
+def profiled(name: str):
+    """PROFILE_ENV ayarlıysa bloğu cProfile ile çalıştırıp ``<klasör>/<name>_<n>.prof`` yazar."""
+    out_dir = os.environ.get(PROFILE_ENV)
+    if not out_dir:
+        yield
+        return
+    global _profile_count
+    _profile_count += 1
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield
+    finally:
+        prof.disable()
+        os.makedirs(out_dir, exist_ok=True)
+        prof.dump_stats(os.path.join(out_dir, f"{name}_{_profile_count:04d}.prof"))
@@ -0,0 +1,166 @@
+# query_engine.py
+import numpy as np
+from dataset import TYPE_ORDER
+
+# Eksik quadrant/diş/hastalık değeri (sütunlarda)
+NONE = -1
+
+# Gruplanabilir sütunlar -> görünen ad
+GROUP_COLUMNS = {
+    "image": "Görsel",
+    "quadrant": "Quadrant",
+    "fdi": "Diş (FDI)",
+    "disease": "Hastalık",
+    "json_type": "JSON Türü",
+}
+
+
+def _name_number(name):
+    """Kategori adından sayı ("3" -> 3); sayı değilse NONE."""
+    try:
+        return int(str(name).strip())
+    except (TypeError, ValueError):
+        return NONE
+
+
+def _map_ids(ids, mapping, default=NONE):
+    """id sütununu sözlükle eşler (eksik id'ler dahil eşlenmeyenler ``default``).
+
+    Python döngüsü sadece farklı id'ler üzerinde döner.
+    """
+    uniq, inverse = np.unique(ids, return_inverse=True)
+    lut = np.array([mapping.get(int(u), default) for u in uniq], dtype=np.int64)
+    return lut[inverse] if len(ids) else np.zeros(0, np.int64)
+
+
+class AnnotationTable:
+    """Yüklü veri setlerindeki tüm anotasyonların sütunlu (NumPy) tablosu.
+
+    Satır başına görsel, JSON tipi, quadrant (1-4), diş (1-8), FDI numarası
+    (quadrant * 10 + diş, örn. 36), hastalık ve bbox alanı tutulur. Süzme ve
+    gruplama sütunlar üzerinde vektörel yapılır; yüz binlerce anotasyonda
+    milisaniyeler sürer.
+    """
+
+    def __init__(self, file_names, disease_names, columns):
+        self.file_names = list(file_names)
+        self.disease_names = list(disease_names)
+        self.image = columns["image"]
+        self.json_type = columns["json_type"]
+        self.quadrant = columns["quadrant"]
+        self.tooth = columns["tooth"]
+        self.fdi = columns["fdi"]
+        self.disease = columns["disease"]
+        self.area = columns["area"]
+
+    @classmethod
+    def from_group(cls, group):
+        """DatasetGroup'taki her veri setinin anotasyon sütunlarından tablo kurar."""
+        file_names = group.file_names
+        file_index = {fn: i for i, fn in enumerate(file_names)}
+        disease_names = sorted({name for d in group.datasets for name in d.categories["categories_3"].values()},
+                               key=str)
+        disease_index = {name: i for i, name in enumerate(disease_names)}
+
+        parts = []
+        for d in group.datasets:
+            cols = d.annotation_columns()
+            n = len(cols["image_id"])
+            image_of = {}
+            for fn, image_id in d.image_id_by_file.items():
+                try:
+                    image_of.setdefault(int(image_id), file_index[fn])
+                except (TypeError, ValueError):
+                    continue
+            if d.json_type == "Quadrant":
+                quadrant = _map_ids(cols["category_id"], {k: _name_number(v) for k, v in
+                                                          d.categories["categories"].items()})
+            else:
+                quadrant = _map_ids(cols["category_id_1"], {k: _name_number(v) for k, v in
+                                                            d.categories["categories_1"].items()})
+            tooth = _map_ids(cols["category_id_2"], {k: _name_number(v) for k, v in
+                                                     d.categories["categories_2"].items()})
+            disease = _map_ids(cols["category_id_3"], {k: disease_index[v] for k, v in
+                                                       d.categories["categories_3"].items()})
+            bbox = cols["bbox"]
+            parts.append({
+                "image": _map_ids(cols["image_id"], image_of),
+                "json_type": np.full(n, TYPE_ORDER.index(d.json_type), dtype=np.int64),
+                "quadrant": quadrant,
+                "tooth": tooth,
+                "fdi": np.where((quadrant > 0) & (tooth > 0), quadrant * 10 + tooth, NONE),
+                "disease": disease,
+                "area": bbox[:, 2] * bbox[:, 3],
+            })
+        keys = ("image", "json_type", "quadrant", "tooth", "fdi", "disease", "area")
+        columns = {k: np.concatenate([p[k] for p in parts]) if parts else np.zeros(0) for k in keys}
+        for k in keys[:-1]:
+            columns[k] = columns[k].astype(np.int32)
+        return cls(file_names, disease_names, columns)
+
+    def __len__(self):
+        return len(self.image)
+
+    # ----------------------
+    # SORGULAR
+    # ----------------------
+    def select(self, json_type=None, quadrant=None, tooth=None, fdi=None, disease=None,
+               min_area=None, max_area=None):
+        """Koşullara uyan satırların maskesi; liste verilen koşullar "herhangi biri" demektir.
+
+        ``disease`` hastalık adı (ya da adları), ``json_type`` TYPE_ORDER'daki ad.
+        """
+        mask = self.image != NONE
+        if json_type is not None:
+            types = [TYPE_ORDER.index(t) for t in np.atleast_1d(json_type)]
+            mask &= np.isin(self.json_type, types)
+        for column, value in ((self.quadrant, quadrant), (self.tooth, tooth), (self.fdi, fdi)):
+            if value is not None:
+                mask &= np.isin(column, np.atleast_1d(value))
+        if disease is not None:
+            names = np.atleast_1d(disease).tolist()
+            mask &= np.isin(self.disease, [i for i, n in enumerate(self.disease_names) if n in names])
+        if min_area is not None:
+            mask &= self.area >= min_area
+        if max_area is not None:
+            mask &= self.area <= max_area
+        return mask
+
+    def images(self, mask):
+        """Eşleşen görseller: [(dosya adı, eşleşen anotasyon sayısı)], çoktan aza."""
+        counts = np.bincount(self.image[mask], minlength=len(self.file_names))
+        order = np.flatnonzero(counts)
+        order = order[np.argsort(-counts[order], kind="stable")]
+        return [(self.file_names[i], int(counts[i])) for i in order]
+
+    def aggregate(self, by, mask):
+        """``by`` sütunlarına göre gruplanmış sayılar: [(değerler..., sayı)], çoktan aza.
+
+        Değerler görünen biçimdedir (dosya adı, hastalık adı, tip adı; eksikse None).
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        if not by:
+            return [(int(mask.sum()),)]
+        keys = np.column_stack([getattr(self, c)[mask] for c in by])
+        if not len(keys):
+            return []
+        uniq, counts = np.unique(keys, axis=0, return_counts=True)
+        order = np.argsort(-counts, kind="stable")
+        return [tuple(self._display(c, v) for c, v in zip(by, uniq[i])) + (int(counts[i]),) for i in order]
+
+    def _display(self, column, value):
+        value = int(value)
+        if value == NONE:
+            return None
+        if column == "image":
+            return self.file_names[value]
+        if column == "disease":
+            return self.disease_names[value]
+        if column == "json_type":
+            return TYPE_ORDER[value]
+        return value
+
+    def values(self, column):
+        """Sütundaki farklı (eksik olmayan) değerler, görünen biçimde ve sıralı."""
+        uniq = np.unique(getattr(self, column))
+        return [self._display(column, v) for v in uniq if v != NONE]
@@ -0,0 +1,107 @@
+# render_cli.py
+"""Bir Quadrant/Enumeration/Disease JSON'undaki tüm görselleri pencere açmadan
+seçili katmanlarla çizip PNG/JPEG olarak kaydeder.
+
+Örnek:
+    python render_cli.py --json train_disease.json --images xrays/ --out out/ \\
+        --layers dis_mask,dis_bbox,text --workers 8
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing as mp
+
+# Alt süreçlerde ayarlanan durum (her süreç kendi QApplication'ını ve veri setini tutar)
+_worker = {}
+
+
+def _init_worker(json_path, images_dir, out_dir, layer_keys, fmt, quality):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    from dataset_loader import load_dataset
+    _worker["app"] = QApplication.instance() or QApplication([])
+    _worker["dataset"] = load_dataset(json_path)
+    _worker.update(images_dir=images_dir, out_dir=out_dir, layer_keys=layer_keys,
+                   fmt=fmt, quality=quality)
+
+
+def _render_one(file_name):
+    """Tek görseli çizip kaydeder; (file_name, hata mesajı veya None) döner."""
+    from PySide6 import QtGui
+    from renderer import render_image
+    w = _worker
+    image = QtGui.QImageReader(os.path.join(w["images_dir"], file_name)).read()
+    if image.isNull():
+        return file_name, "görsel okunamadı"
+    dataset = w["dataset"]
+    out = render_image(image, dataset, dataset.image_id_for(file_name), w["layer_keys"])
+    stem = os.path.splitext(file_name)[0]
+    target = os.path.join(w["out_dir"], f"{stem}.{w['fmt']}")
+    # Kalite sadece JPEG için; PNG'de Qt bunu sıkıştırma düzeyi sayar (-1: varsayılan)
+    quality = w["quality"] if w["fmt"] == "jpg" else -1
+    if not out.save(target, w["fmt"].upper(), quality):
+        return file_name, "kaydedilemedi"
+    return file_name, None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DENTEX anotasyonlarını toplu ve penceresiz çizer.")
+    parser.add_argument("--json", required=True, help="Quadrant/Enumeration/Disease JSON dosyası")
+    parser.add_argument("--images", required=True, help="Görsellerin bulunduğu klasör")
+    parser.add_argument("--out", required=True, help="Çıktı klasörü")
+    parser.add_argument("--layers", default="",
+                        help="Virgülle ayrılmış katmanlar (boşsa JSON tipine uyan tüm katmanlar)")
+    parser.add_argument("--format", default="png", choices=["png", "jpg"], help="Çıktı biçimi")
+    parser.add_argument("--quality", type=int, default=90, help="JPEG kalitesi (0-100; PNG için yok sayılır)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Süreç sayısı")
+    args = parser.parse_args(argv)
+
+    # Ana süreçte Qt uygulaması kurulmaz; alt süreçler 'spawn' ile temiz başlar
+    from dataset_loader import load_dataset
+    from renderer import LAYERS
+    dataset = load_dataset(args.json)
+    if dataset is None:
+        print("JSON formatı tanınmadı!", file=sys.stderr)
+        return 2
+    json_type = dataset.json_type
+
+    if args.layers:
+        layer_keys = [k.strip() for k in args.layers.split(",") if k.strip()]
+        unknown = [k for k in layer_keys if k not in LAYERS]
+        if unknown:
+            print(f"Bilinmeyen katman(lar): {', '.join(unknown)} (geçerli: {', '.join(LAYERS)})", file=sys.stderr)
+            return 2
+    else:
+        layer_keys = [k for k, (t, _) in LAYERS.items() if t in (None, json_type)]
+
+    on_disk = set(os.listdir(args.images))
+    file_names = [fn for fn in dataset.file_names if fn in on_disk]
+    del dataset
+    os.makedirs(args.out, exist_ok=True)
+
+    print(f"{json_type}: {len(file_names)} görsel, katmanlar: {', '.join(layer_keys)}")
+    start = time.perf_counter()
+    failed = 0
+    ctx = mp.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max(1, args.workers), mp_context=ctx, initializer=_init_worker,
+                             initargs=(os.path.abspath(args.json), args.images, args.out,
+                                       layer_keys, args.format, args.quality)) as pool:
+        futures = [pool.submit(_render_one, fn) for fn in file_names]
+        for done, fut in enumerate(as_completed(futures), 1):
+            file_name, error = fut.result()
+            if error:
+                failed += 1
+                print(f"  ! {file_name}: {error}", file=sys.stderr)
+            if done % 50 == 0:
+                print(f"  {done}/{len(file_names)}")
+    elapsed = time.perf_counter() - start
+    ok = len(file_names) - failed
+    rate = ok / elapsed if elapsed > 0 else 0.0
+    print(f"Bitti: {ok} görsel {elapsed:.1f} sn'de ({rate:.2f} görsel/sn), {failed} hata")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+# renderer.py
+from PySide6 import QtCore, QtGui, QtWidgets
+from overlay_items import LayerItem, MaskLayerItem
+
+# Katman anahtarı -> (gerektirdiği JSON tipi, z değeri); None: her tipte çizilir
+LAYERS = {
+    "quad_bbox": ("Quadrant", 10),
+    "quad_mask": ("Quadrant", 8),
+    "teeth_bbox": ("Enumeration", 10),
+    "teeth_mask": ("Enumeration", 8),
+    "dis_bbox": ("Disease", 10),
+    "dis_mask": ("Disease", 8),
+    "text": (None, 12),
+}
+
+
+def build_layer(key, anns, json_type):
+    """Tek katmanı verilen anotasyonlardan tek bir LayerItem olarak kurar.
+
+    Öğe sahneye eklenmez: viewer'da komşu vakalar için önceden kurulabilir,
+    render_image'da da sahnesiz doğrudan bir QPainter'a çizilir. Maske
+    katmanları bitmap'ten (yakınlaştırınca vektörden) çizilen MaskLayerItem
+    olarak kurulur.
+    """
+    if key == "text":
+        return build_text_layer([(json_type, anns)])
+    layer = MaskLayerItem() if key.endswith("_mask") else LayerItem()
+    for a in anns:
+        bbox = a.bbox  # [x, y, w, h]
+        segs = a.rings  # (N, 2) NumPy halkaları
+
+        # 1) QUADRANT: bbox/mask
+        if key == "quad_bbox" and bbox:
+            layer.draw_bbox(bbox, pen=QtGui.QPen(QtGui.QColor(220, 0, 0), 2.0))
+        elif key == "quad_mask" and segs:
+            layer.draw_polygons(segs, fill=QtGui.QColor(220, 0, 0, 70),
+                                outline=QtGui.QColor(220, 0, 0), outline_w=1.5)
+
+        # 2) ENUMERATION: diş bbox/mask
+        elif key == "teeth_bbox" and bbox:
+            layer.draw_bbox(bbox, pen=QtGui.QPen(QtGui.QColor(220, 0, 0), 2.0))
+        elif key == "teeth_mask" and segs:
+            layer.draw_polygons(segs, fill=QtGui.QColor(0, 140, 255, 70),
+                                outline=QtGui.QColor(0, 140, 255), outline_w=1.5)
+
+        # 3) DISEASE: sadece hastalıklı dişler var → disease bbox/mask
+        elif key == "dis_bbox" and bbox:
+            layer.draw_bbox(bbox, pen=QtGui.QPen(a.color, 2.0))
+        elif key == "dis_mask" and segs:
+            color = a.color
+            fill = QtGui.QColor(color.red(), color.green(), color.blue(), 70)
+            layer.draw_polygons(segs, fill=fill, outline=color, outline_w=1.5)
+
+    layer.setZValue(LAYERS[key][1])
+    return layer
+
+
+def build_text_layer(sources):
+    """Yazı katmanını bir ya da birkaç veri setinin anotasyonlarından kurar.
+
+    ``sources`` [(json_type, anotasyonlar)], en ayrıntılı tipten başlayarak.
+    Daha ayrıntılı bir tipte etiketlenmiş diş (aynı quadrant ve diş adı) daha
+    az ayrıntılı tipte tekrar etiketlenmez: hastalıklı dişler Disease'ten,
+    diğerleri Enumeration'dan, quadrant'lar Quadrant'tan etiket alır.
+    """
+    layer = LayerItem()
+    labels = []  # (metin, bağlandığı kutu)
+    labeled_teeth = set()
+    for json_type, anns in sources:
+        teeth = set()
+        for a in anns:
+            tooth = (a.q_name, a.t_name) if a.t_name is not None else None
+            if tooth in labeled_teeth:
+                continue
+            label = build_short_label(json_type, a.q_name, a.t_name, a.d_name)
+            if not label:
+                continue
+            # Yazı bbox'a, yoksa polygon centroid'ine bağlanır; yeri tüm etiketler
+            # toplandıktan sonra çakışmasız seçilir
+            if a.bbox:
+                labels.append((label, tuple(a.bbox)))
+            elif a.rings and a.centroid is not None:
+                c = a.centroid  # ilk halkanın alan ağırlıklı centroid'i (yüklemede hesaplandı)
+                labels.append((label, (c.x(), c.y(), 0.0, 0.0)))
+            else:
+                continue
+            if tooth is not None:
+                teeth.add(tooth)
+        # Aynı tipte aynı dişe ait birden çok anotasyon (örn. iki hastalık) hepsi etiketlenir
+        labeled_teeth |= teeth
+
+    if labels:
+        layer.draw_labels(labels)
+    layer.setZValue(LAYERS["text"][1])
+    return layer
+
+
+def build_short_label(json_type, q_name, t_name, d_name):
+    """Kısa format A: Quadrant -> 'Q:1', Enumeration -> 'Q:1 T:3', Disease -> 'Q:1 T:3 D:xyz'."""
+    if json_type == "Quadrant":
+        if q_name: return f"Q:{q_name}"
+    elif json_type == "Enumeration":
+        parts = []
+        if q_name: parts.append(f"Q:{q_name}")
+        if t_name: parts.append(f"T:{t_name}")
+        return " ".join(parts) if parts else ""
+    elif json_type == "Disease":
+        parts = []
+        if q_name: parts.append(f"Q:{q_name}")
+        if t_name: parts.append(f"T:{t_name}")
+        if d_name: parts.append(f"D:{d_name}")
+        return " ".join(parts) if parts else ""
+    return ""    
+
+
+def render_image(image: QtGui.QImage, dataset, image_id, layer_keys):
+    """Görselin üstüne seçili katmanları çizip yeni bir QImage döner (pencere gerekmez)."""
+    canvas = image.convertToFormat(QtGui.QImage.Format_RGB32)
+    anns = dataset.annotations_for(image_id)
+    keys = [k for k in layer_keys if LAYERS[k][0] in (None, dataset.json_type)]
+    painter = QtGui.QPainter(canvas)
+    painter.setRenderHints(QtGui.QPainter.Antialiasing | QtGui.QPainter.TextAntialiasing)
+    option = QtWidgets.QStyleOptionGraphicsItem()  # birim dönüşüm: tam çözünürlük
+    option.exposedRect = QtCore.QRectF(canvas.rect())
+    for key in sorted(keys, key=lambda k: LAYERS[k][1]):
+        build_layer(key, anns, dataset.json_type).paint(painter, option)
+    painter.end()
+    return canvas
@@ -0,0 +1,309 @@
+# search_page.py
+import os
+import threading
+import time
+from PySide6 import QtCore, QtWidgets
+from dataset import DatasetGroup
+from dataset_loader import load_dataset
+from query_engine import GROUP_COLUMNS, AnnotationTable
+
+# "Grupla" seçenekleri -> gruplanan sütunlar
+GROUPINGS = [
+    ("Görsel", ("image",)),
+    ("Quadrant", ("quadrant",)),
+    ("Diş (FDI)", ("fdi",)),
+    ("Hastalık", ("disease",)),
+    ("Quadrant + Hastalık", ("quadrant", "disease")),
+    ("Diş (FDI) + Hastalık", ("fdi", "disease")),
+    ("JSON Türü", ("json_type",)),
+]
+ALL = "Tümü"
+
+
+class TableBuildSignals(QtCore.QObject):
+    built = QtCore.Signal(int, object)       # token, AnnotationTable
+    failed = QtCore.Signal(int, str, str)    # token, başlık, mesaj
+
+
+class TableBuildTask(QtCore.QRunnable):
+    """JSON'ları (paylaşılan önbellekten) yükleyip arama tablosunu kurar; GUI thread'inde çalışmaz."""
+
+    def __init__(self, token: int, json_paths):
+        super().__init__()
+        self.token = token
+        self.json_paths = list(json_paths)
+        self.signals = TableBuildSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def run(self):
+        datasets = []
+        for json_path in self.json_paths:
+            name = os.path.basename(json_path)
+            try:
+                dataset = load_dataset(json_path)
+            except Exception as e:
+                if not self._cancelled.is_set():
+                    self.signals.failed.emit(self.token, "JSON Hatası", f"JSON okunamadı ({name}):\n{e}")
+                return
+            if self._cancelled.is_set():
+                return
+            if dataset is None:
+                self.signals.failed.emit(self.token, "Hatalı JSON", f"JSON formatı tanınmadı ({name})!")
+                return
+            datasets.append(dataset)
+        table = AnnotationTable.from_group(DatasetGroup(datasets))
+        if not self._cancelled.is_set():
+            self.signals.built.emit(self.token, table)
+
+
+class SearchPage(QtWidgets.QWidget):
+    """Veri seti geneli istatistik ve arama (örn. "36 numaralı dişte çürük olan görseller").
+
+    Görsel satırına çift tıklanınca vaka görüntüleyicide açılır; gruplanmış
+    satıra çift tıklanınca o satırın değerleri süzgece eklenir.
+    """
+    open_case = QtCore.Signal(str, object)  # image_path, json_paths
+
+    def __init__(self):
+        super().__init__()
+        self.images_dir = None
+        self.json_paths = []
+        self._table = None
+        self._task = None
+        self._token = 0
+        self._dirty = False   # kaynaklar değişti; sekme görününce tablo yeniden kurulur
+        self._rows = []       # o anki sonuç satırları (çift tıklama için)
+        self._grouping = GROUPINGS[0][1]
+
+        root = QtWidgets.QVBoxLayout(self)
+        root.addWidget(QtWidgets.QLabel("<h2>🔎 Veri Seti Arama</h2>"))
+
+        # --- Kaynaklar ---
+        src = QtWidgets.QGridLayout()
+        self.btn_json = QtWidgets.QPushButton("🧾 JSON Seç (birden fazla seçilebilir)")
+        self.btn_dir = QtWidgets.QPushButton("📂 Görsel Klasörü Seç")
+        self.lbl_json = QtWidgets.QLabel("Seçilen JSON: Henüz seçilmedi")
+        self.lbl_dir = QtWidgets.QLabel("Seçilen Klasör: Henüz seçilmedi")
+        self.btn_json.clicked.connect(self.select_json)
+        self.btn_dir.clicked.connect(self.select_images_dir)
+        src.addWidget(self.btn_json, 0, 0)
+        src.addWidget(self.lbl_json, 0, 1)
+        src.addWidget(self.btn_dir, 1, 0)
+        src.addWidget(self.lbl_dir, 1, 1)
+        src.setColumnStretch(1, 1)
+        root.addLayout(src)
+
+        # --- Süzgeçler ---
+        self.grp_filters = QtWidgets.QGroupBox("Süzgeçler")
+        form = QtWidgets.QFormLayout(self.grp_filters)
+        self.cmb_type = QtWidgets.QComboBox()
+        self.cmb_quad = QtWidgets.QComboBox()
+        self.ed_fdi = QtWidgets.QLineEdit()
+        self.ed_fdi.setPlaceholderText("örn. 36 ya da 36, 46")
+        self.cmb_disease = QtWidgets.QComboBox()
+        self.sp_min_area = QtWidgets.QDoubleSpinBox()
+        self.sp_min_area.setRange(0, 1e9)
+        self.sp_min_area.setDecimals(0)
+        self.sp_min_area.setSuffix(" px²")
+        self.cmb_group = QtWidgets.QComboBox()
+        self.cmb_group.addItems([label for label, _ in GROUPINGS])
+        form.addRow("JSON Türü:", self.cmb_type)
+        form.addRow("Quadrant:", self.cmb_quad)
+        form.addRow("Diş (FDI):", self.ed_fdi)
+        form.addRow("Hastalık:", self.cmb_disease)
+        form.addRow("En küçük bbox alanı:", self.sp_min_area)
+        form.addRow("Grupla:", self.cmb_group)
+        root.addWidget(self.grp_filters)
+
+        # Sorgu milisaniyeler sürdüğü için her değişiklikte yeniden çalıştırılır
+        for cmb in (self.cmb_type, self.cmb_quad, self.cmb_disease, self.cmb_group):
+            cmb.currentIndexChanged.connect(self.run_query)
+        self.ed_fdi.textChanged.connect(self.run_query)
+        self.sp_min_area.valueChanged.connect(self.run_query)
+
+        # --- Sonuçlar ---
+        self.lbl_summary = QtWidgets.QLabel("—")
+        root.addWidget(self.lbl_summary)
+        self.tbl = QtWidgets.QTableWidget(0, 0)
+        self.tbl.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.tbl.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.tbl.verticalHeader().setVisible(False)
+        self.tbl.horizontalHeader().setStretchLastSection(True)
+        self.tbl.cellDoubleClicked.connect(self._on_row_activated)
+        root.addWidget(self.tbl, 1)
+
+        self._set_filters_enabled(False)
+
+    # ----------------------
+    # KAYNAKLAR
+    # ----------------------
+    def select_json(self):
+        paths, _ = QtWidgets.QFileDialog.getOpenFileNames(self, "JSON Dosyası Seç", "", "JSON Files (*.json)")
+        if paths:
+            self.set_sources(self.images_dir, paths)
+
+    def select_images_dir(self):
+        path = QtWidgets.QFileDialog.getExistingDirectory(self, "Görsel Klasörü Seç", "")
+        if path:
+            self.set_sources(path, self.json_paths)
+
+    def set_sources(self, images_dir, json_paths):
+        """Aranacak JSON'ları ve görsellerin klasörünü ayarlar; tablo sekme görününce kurulur."""
+        json_paths = [json_paths] if isinstance(json_paths, str) else list(json_paths or [])
+        self.images_dir = images_dir
+        self.lbl_dir.setText(f"Seçilen Klasör: {images_dir or 'Henüz seçilmedi'}")
+        self.lbl_json.setText("Seçilen JSON: " + (", ".join(json_paths) or "Henüz seçilmedi"))
+        if json_paths != self.json_paths:
+            self.json_paths = json_paths
+            self._dirty = bool(json_paths)
+            if self.isVisible():
+                self.build_table()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._dirty:
+            self.build_table()
+
+    def build_table(self):
+        """Arama tablosunu arka planda kurar (JSON'lar görüntüleyiciyle aynı önbellekten gelir)."""
+        self._dirty = False
+        if self._task is not None:
+            self._task.cancel()
+        self._token += 1
+        self._task = TableBuildTask(self._token, self.json_paths)
+        self._task.signals.built.connect(self._on_table_built)
+        self._task.signals.failed.connect(self._on_table_failed)
+        self._set_filters_enabled(False)
+        self.lbl_summary.setText("Tablo kuruluyor…")
+        QtCore.QThreadPool.globalInstance().start(self._task)
+
+    def _on_table_built(self, token: int, table):
+        if token != self._token:
+            return
+        self._task = None
+        self._table = table
+        self._fill_combo(self.cmb_type, table.values("json_type"), default=table.values("json_type")[-1:])
+        self._fill_combo(self.cmb_quad, table.values("quadrant"))
+        self._fill_combo(self.cmb_disease, table.values("disease"))
+        self._set_filters_enabled(True)
+        self.run_query()
+
+    def _on_table_failed(self, token: int, title: str, message: str):
+        if token != self._token:
+            return
+        self._task = None
+        self.lbl_summary.setText("Hata")
+        QtWidgets.QMessageBox.warning(self, title, message)
+
+    @staticmethod
+    def _fill_combo(cmb, values, default=()):
+        """Seçenekleri "Tümü" + değerler yapar; mümkünse önceki seçimi korur."""
+        previous = cmb.currentData()
+        cmb.blockSignals(True)
+        cmb.clear()
+        cmb.addItem(ALL, None)
+        for v in values:
+            cmb.addItem(str(v), v)
+        keep = previous if previous in values else (default[0] if default else None)
+        cmb.setCurrentIndex(max(0, cmb.findData(keep)) if keep is not None else 0)
+        cmb.blockSignals(False)
+
+    def _set_filters_enabled(self, enabled: bool):
+        self.grp_filters.setEnabled(enabled)
+
+    # ----------------------
+    # SORGU
+    # ----------------------
+    def _parse_fdi(self):
+        """"36, 46" -> [36, 46]; boşsa None, hatalıysa ValueError."""
+        text = self.ed_fdi.text().replace(";", ",").strip()
+        if not text:
+            return None
+        return [int(part) for part in text.replace(" ", ",").split(",") if part]
+
+    def current_filters(self):
+        return {
+            "json_type": self.cmb_type.currentData(),
+            "quadrant": self.cmb_quad.currentData(),
+            "fdi": self._parse_fdi(),
+            "disease": self.cmb_disease.currentData(),
+            "min_area": self.sp_min_area.value() or None,
+        }
+
+    def run_query(self):
+        if self._table is None:
+            return
+        try:
+            filters = self.current_filters()
+        except ValueError:
+            self.lbl_summary.setText("Diş numarası sayı olmalı (örn. 36)")
+            return
+        self._grouping = GROUPINGS[self.cmb_group.currentIndex()][1]
+        t0 = time.perf_counter()
+        mask = self._table.select(**filters)
+        if self._grouping == ("image",):
+            rows = self._table.images(mask)
+        else:
+            rows = self._table.aggregate(self._grouping, mask)
+        ms = (time.perf_counter() - t0) * 1000.0
+        self._rows = rows
+        matched = int(mask.sum())
+        n_images = len(rows) if self._grouping == ("image",) else len(self._table.images(mask))
+        self.lbl_summary.setText(f"{matched:,} anotasyon, {n_images:,} görsel ({ms:.1f} ms)")
+        self._fill_results(rows)
+
+    def _fill_results(self, rows):
+        headers = [GROUP_COLUMNS[c] for c in self._grouping] + ["Sayı"]
+        self.tbl.setSortingEnabled(False)
+        self.tbl.clear()
+        self.tbl.setColumnCount(len(headers))
+        self.tbl.setHorizontalHeaderLabels(headers)
+        self.tbl.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            for c, value in enumerate(row):
+                item = QtWidgets.QTableWidgetItem()
+                # Sayılar sayı olarak sıralansın
+                item.setData(QtCore.Qt.DisplayRole, value if value is not None else "—")
+                item.setData(QtCore.Qt.UserRole, r)
+                self.tbl.setItem(r, c, item)
+        self.tbl.resizeColumnsToContents()
+        self.tbl.setSortingEnabled(True)
+
+    def _on_row_activated(self, row: int, _column: int):
+        item = self.tbl.item(row, 0)
+        if item is None:
+            return
+        values = self._rows[item.data(QtCore.Qt.UserRole)]
+        if self._grouping == ("image",):
+            self._open_image(values[0])
+            return
+        # Gruplanmış satır: değerleri süzgece yaz ve görsellere in
+        for column, value in zip(self._grouping, values):
+            if value is None:
+                continue
+            if column == "fdi":
+                self.ed_fdi.blockSignals(True)
+                self.ed_fdi.setText(str(value))
+                self.ed_fdi.blockSignals(False)
+            else:
+                cmb = {"quadrant": self.cmb_quad, "disease": self.cmb_disease, "json_type": self.cmb_type}[column]
+                cmb.blockSignals(True)
+                cmb.setCurrentIndex(max(0, cmb.findData(value)))
+                cmb.blockSignals(False)
+        if self.cmb_group.currentIndex() == 0:
+            self.run_query()
+        else:
+            self.cmb_group.setCurrentIndex(0)  # run_query'yi tetikler
+
+    def _open_image(self, file_name: str):
+        if not self.images_dir:
+            QtWidgets.QMessageBox.warning(self, "Eksik Klasör", "Görseli açmak için görsel klasörünü seçin!")
+            return
+        image_path = os.path.join(self.images_dir, file_name)
+        if not os.path.exists(image_path):
+            QtWidgets.QMessageBox.warning(self, "Bulunamadı", f"Görsel klasörde yok:\n{image_path}")
+            return
+        self.open_case.emit(image_path, self.json_paths)
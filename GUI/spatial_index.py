@@ -0,0 +1,73 @@
+# spatial_index.py
+import math
+from collections import defaultdict
+import numpy as np
+from geometry import point_in_ring
+
+# Izgara hücresinin kenarı (görsel pikseli)
+GRID_CELL = 128
+
+
+class AnnotationIndex:
+    """Bir görselin anotasyonları için düzgün ızgara indeksi.
+
+    Her anotasyon kutusunun (bbox ile halkalarının kapsayan kutusu) kestiği
+    hücrelere yazılır. Sorguda sadece noktanın hücresindeki adaylara bakılır;
+    poligon içi testi sadece kutusu noktayı içerenlere yapılır.
+    """
+
+    def __init__(self, anns, geom, cell: float = GRID_CELL):
+        self.anns = anns
+        self._cell = float(cell)
+        boxes = np.full((len(anns), 4), np.nan)  # x0, y0, x1, y1
+        for i, a in enumerate(anns):
+            lo, hi = geom.ann_ring_offsets[i], geom.ann_ring_offsets[i + 1]
+            parts = []
+            if hi > lo:
+                rb = geom.bboxes[lo:hi]
+                parts.append((rb[:, 0].min(), rb[:, 1].min(),
+                              (rb[:, 0] + rb[:, 2]).max(), (rb[:, 1] + rb[:, 3]).max()))
+            if a.bbox:
+                x, y, w, h = a.bbox
+                parts.append((x, y, x + w, y + h))
+            if parts:
+                p = np.asarray(parts, dtype=np.float64)
+                boxes[i] = (p[:, 0].min(), p[:, 1].min(), p[:, 2].max(), p[:, 3].max())
+        self._boxes = boxes
+
+        self._cells = defaultdict(list)  # (cx, cy) -> [anotasyon indeksi]
+        for i, (x0, y0, x1, y1) in enumerate(boxes):
+            if np.isnan(x0):
+                continue
+            for cx in range(self._cell_of(x0), self._cell_of(x1) + 1):
+                for cy in range(self._cell_of(y0), self._cell_of(y1) + 1):
+                    self._cells[(cx, cy)].append(i)
+        # Küçük anotasyon (diş/hastalık) büyüğün (quadrant) önüne geçsin
+        self._order = {i: (a.area or _box_area(boxes[i])) for i, a in enumerate(anns)}
+
+    def _cell_of(self, v: float):
+        return int(math.floor(v / self._cell))
+
+    def hits(self, x: float, y: float):
+        """Noktayı içeren anotasyonların indeksleri, küçükten büyüğe."""
+        out = []
+        for i in self._cells.get((self._cell_of(x), self._cell_of(y)), ()):
+            x0, y0, x1, y1 = self._boxes[i]
+            if not (x0 <= x <= x1 and y0 <= y <= y1):
+                continue
+            rings = self.anns[i].rings
+            # Segmentasyonu olmayan anotasyonda kutu testi yeterli
+            if not rings or any(point_in_ring(ring, x, y) for ring in rings):
+                out.append(i)
+        out.sort(key=self._order.get)
+        return out
+
+    def at(self, x: float, y: float):
+        """Noktadaki en küçük anotasyonun indeksi (yoksa None)."""
+        hits = self.hits(x, y)
+        return hits[0] if hits else None
+
+
+def _box_area(box):
+    x0, y0, x1, y1 = box
+    return 0.0 if np.isnan(x0) else float((x1 - x0) * (y1 - y0))
@@ -0,0 +1,109 @@
+# tiled_image.py
+import math
+from collections import OrderedDict
+from PySide6 import QtCore, QtGui, QtWidgets
+
+TILE_SIZE = 512
+# Sahnede tutulan karo QPixmap'leri için üst sınır (tüm seviyeler toplamı)
+TILE_CACHE_BYTES = 192 * 1024 * 1024
+
+
+class ImagePyramid:
+    """Tam çözünürlüklü görsel + her adımda yarıya inen seviyeler.
+
+    Sadece QImage kullanır; bu yüzden arka plan thread'inde kurulabilir.
+    """
+
+    def __init__(self, image: QtGui.QImage, tile_size: int = TILE_SIZE):
+        self.levels = [image]
+        while not image.isNull() and max(image.width(), image.height()) > tile_size:
+            image = image.scaled(max(1, image.width() // 2), max(1, image.height() // 2),
+                                 QtCore.Qt.IgnoreAspectRatio, QtCore.Qt.SmoothTransformation)
+            self.levels.append(image)
+
+    def isNull(self):
+        return self.levels[0].isNull()
+
+    def width(self):
+        return self.levels[0].width()
+
+    def height(self):
+        return self.levels[0].height()
+
+    def sizeInBytes(self):
+        return sum(level.sizeInBytes() for level in self.levels)
+
+    def level_for(self, lod: float):
+        """Ekrandaki ölçeğe (lod) göre ekran pikselinden küçük olmayan en kaba seviye."""
+        if lod >= 1.0 or lod <= 0.0:
+            return 0
+        return min(len(self.levels) - 1, int(math.floor(math.log2(1.0 / lod))))
+
+
+class TiledImageItem(QtWidgets.QGraphicsItem):
+    """Piramit seviyelerini karolara bölüp sadece görünen karoları çizen görsel öğesi.
+
+    Karolar ilk çizildiklerinde QPixmap'e çevrilir ve bayt sınırlı LRU'da tutulur;
+    böylece her karede devasa bir bitmap yeniden örneklenmez.
+    """
+
+    def __init__(self, pyramid: ImagePyramid, tile_size: int = TILE_SIZE,
+                 cache_bytes: int = TILE_CACHE_BYTES, parent=None):
+        super().__init__(parent)
+        self._pyramid = pyramid
+        self._tile = tile_size
+        self._cache_bytes = cache_bytes
+        self._tiles = OrderedDict()  # (seviye, tx, ty) -> QPixmap
+        self._tiles_total = 0
+        self._rect = QtCore.QRectF(0, 0, pyramid.width(), pyramid.height())
+        # exposedRect ile sadece görünen alan çizilsin
+        self.setFlag(QtWidgets.QGraphicsItem.ItemUsesExtendedStyleOption, True)
+
+    def boundingRect(self):
+        return self._rect
+
+    def _tile_pixmap(self, level: int, tx: int, ty: int):
+        key = (level, tx, ty)
+        pix = self._tiles.get(key)
+        if pix is not None:
+            self._tiles.move_to_end(key)
+            return pix
+        img = self._pyramid.levels[level]
+        t = self._tile
+        # Kenar karoları görselin dışına taşmasın (copy dışarıyı siyahla doldurur)
+        w = min(t, img.width() - tx * t)
+        h = min(t, img.height() - ty * t)
+        pix = QtGui.QPixmap.fromImage(img.copy(tx * t, ty * t, w, h))
+        self._tiles[key] = pix
+        self._tiles_total += pix.width() * pix.height() * 4
+        while self._tiles_total > self._cache_bytes and len(self._tiles) > 1:
+            _, old = self._tiles.popitem(last=False)
+            self._tiles_total -= old.width() * old.height() * 4
+        return pix
+
+    def paint(self, painter, option, widget=None):
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        level = self._pyramid.level_for(lod)
+        img = self._pyramid.levels[level]
+        sx = self._rect.width() / img.width()
+        sy = self._rect.height() / img.height()
+        t = self._tile
+
+        exposed = option.exposedRect.intersected(self._rect)
+        if exposed.isEmpty():
+            return
+        # Görünen alanı seviye koordinatlarına çevirip karo aralığını bul
+        tx0 = max(0, int(exposed.left() / sx) // t)
+        ty0 = max(0, int(exposed.top() / sy) // t)
+        tx1 = min((img.width() - 1) // t, int(math.ceil(exposed.right() / sx)) // t)
+        ty1 = min((img.height() - 1) // t, int(math.ceil(exposed.bottom() / sy)) // t)
+
+        painter.save()
+        # Kenar yumuşatma karo sınırlarında ince çizgiler (dikiş) bırakır
+        painter.setRenderHint(QtGui.QPainter.Antialiasing, False)
+        for ty in range(ty0, ty1 + 1):
+            for tx in range(tx0, tx1 + 1):
+                pix = self._tile_pixmap(level, tx, ty)
+                target = QtCore.QRectF(tx * t * sx, ty * t * sy, pix.width() * sx, pix.height() * sy)
+                painter.drawPixmap(target, pix, QtCore.QRectF(pix.rect()))
+        painter.restore()
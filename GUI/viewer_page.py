@@ -1,9 +1,38 @@
 # viewer_page.py
 import os
+import time
+from collections import OrderedDict
 from PySide6 import QtCore, QtGui, QtWidgets
-import json
-from collections import defaultdict
+from case_loader import CaseLoadTask, ImageCache, ImageDecodeTask
+from tiled_image import ImagePyramid, TiledImageItem
+from renderer import LAYERS, build_layer, build_text_layer
+from geometry import rings_to_path
+from spatial_index import AnnotationIndex
+from perf import current_rss_bytes, profiled, recorder
+
+# Toplu gezinmede önceden çözülecek/çizilecek komşu vaka sayısı (her yönde)
+PREFETCH_RADIUS = 2
+# Katmanları önbellekte tutulan vaka sayısı (o anki + komşular + biraz geçmiş)
+OVERLAY_CACHE_SIZE = 2 * PREFETCH_RADIUS + 3
+# Önbellekteki katmanların (maske bitmap'leri, pixmap'ler, vektör yollar) bayt sınırı
+OVERLAY_CACHE_BYTES = 256 * 1024 * 1024
+# Görünümden bu kadar (görünür alanın kenarının katı) uzaklaşan katman kutuları bırakılır
+RELEASE_MARGIN = 1.0
+# Kaydırma/yakınlaştırma durduktan sonra bırakma için beklenen süre (ms)
+RELEASE_DELAY_MS = 200
+# İmlecin altındaki / tıklanarak seçilen anotasyonun vurgu kalemleri (ekran pikseli)
+HOVER_PEN = (QtGui.QColor(255, 235, 0), 2.0)
+SELECT_PEN = (QtGui.QColor(0, 255, 255), 3.0)
+# Performans panelinin en sık yenilenme aralığı (ms); her karede tablo yenilenmez
+PERF_REFRESH_MS = 250
+
 class ImageView(QtWidgets.QGraphicsView):
+    hovered = QtCore.Signal(float, float)   # imlecin sahne (görsel pikseli) konumu
+    clicked = QtCore.Signal(float, float)   # sürüklemeden yapılan tıklamanın sahne konumu
+    left = QtCore.Signal()                  # imleç görünümden çıktı
+    view_changed = QtCore.Signal()          # kaydırma ya da yakınlaştırma (görünür alan değişti)
+    painted = QtCore.Signal(float)          # bir görünüm karesinin Qt çizim süresi (ms)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setScene(QtWidgets.QGraphicsScene(self))
@@ -15,18 +44,63 @@ class ImageView(QtWidgets.QGraphicsView):
         self.setResizeAnchor(QtWidgets.QGraphicsView.AnchorUnderMouse)
         self._pix_item = None
         self._zoom = 0
+        self._press_pos = None
+        self.viewport().setMouseTracking(True)
 
     def load_image(self, path: str):
-        pix = QtGui.QPixmap(path)
-        if pix.isNull():
+        return self.set_image(ImagePyramid(QtGui.QImage(path)))
+
+    def set_image(self, pyramid: ImagePyramid):
+        """Arka planda kurulmuş görsel piramidini karolu öğe olarak sahneye koyar."""
+        if pyramid.isNull():
             return False
         self.scene().clear()
-        self._pix_item = self.scene().addPixmap(pix)
-        self.scene().setSceneRect(pix.rect())
+        self._pix_item = TiledImageItem(pyramid)
+        self.scene().addItem(self._pix_item)
+        self.scene().setSceneRect(self._pix_item.boundingRect())
         self._zoom = 0
         self.fitInView(self.sceneRect(), QtCore.Qt.KeepAspectRatio)
+        self.view_changed.emit()
         return True
 
+    def visible_scene_rect(self):
+        """Görünümde o an görünen sahne alanı."""
+        return self.mapToScene(self.viewport().rect()).boundingRect()
+
+    def paintEvent(self, event: QtGui.QPaintEvent):
+        t0 = time.perf_counter()
+        super().paintEvent(event)
+        self.painted.emit((time.perf_counter() - t0) * 1000.0)
+
+    def scrollContentsBy(self, dx: int, dy: int):
+        super().scrollContentsBy(dx, dy)
+        self.view_changed.emit()
+
+    def mouseMoveEvent(self, event: QtGui.QMouseEvent):
+        super().mouseMoveEvent(event)
+        if self._pix_item is not None:
+            p = self.mapToScene(event.position().toPoint())
+            self.hovered.emit(p.x(), p.y())
+
+    def mousePressEvent(self, event: QtGui.QMouseEvent):
+        if event.button() == QtCore.Qt.LeftButton:
+            self._press_pos = event.position().toPoint()
+        super().mousePressEvent(event)
+
+    def mouseReleaseEvent(self, event: QtGui.QMouseEvent):
+        super().mouseReleaseEvent(event)
+        press, self._press_pos = self._press_pos, None
+        if event.button() != QtCore.Qt.LeftButton or press is None or self._pix_item is None:
+            return
+        # Elle kaydırma (ScrollHandDrag) tıklama sayılmaz
+        if (event.position().toPoint() - press).manhattanLength() < QtWidgets.QApplication.startDragDistance():
+            p = self.mapToScene(press)
+            self.clicked.emit(p.x(), p.y())
+
+    def leaveEvent(self, event):
+        super().leaveEvent(event)
+        self.left.emit()
+
     def wheelEvent(self, event: QtGui.QWheelEvent):
         if self._pix_item is None:
             return super().wheelEvent(event)
@@ -38,19 +112,30 @@ class ImageView(QtWidgets.QGraphicsView):
             return
         self._zoom += (1 if delta > 0 else -1)
         self.scale(factor, factor)
+        self.view_changed.emit()
 
 
 class ViewerPage(QtWidgets.QWidget):
     def __init__(self):
         super().__init__()
         self.image_path = None
-        self.json_type = None
+        self.json_types = []  # yüklü JSON tipleri (TYPE_ORDER sırasıyla)
 
         root = QtWidgets.QHBoxLayout(self)
 
         # SOL – Görsel
         self.view = ImageView()
         root.addWidget(self.view, 3)
+        self.view.hovered.connect(self._on_view_hovered)
+        self.view.clicked.connect(self._on_view_clicked)
+        self.view.left.connect(lambda: self._set_hovered(None))
+        # Kaydırma durunca görünümden uzak katman kutuları bırakılır
+        self._release_timer = QtCore.QTimer(self)
+        self._release_timer.setSingleShot(True)
+        self._release_timer.setInterval(RELEASE_DELAY_MS)
+        self._release_timer.timeout.connect(self._release_offscreen_overlays)
+        self.view.view_changed.connect(self._schedule_release)
+        self.view.painted.connect(self._on_view_painted)
 
         # SAĞ – Bilgi + Kontroller
         right = QtWidgets.QVBoxLayout()
@@ -61,15 +146,94 @@ class ViewerPage(QtWidgets.QWidget):
         self.lbl_img = QtWidgets.QLabel("—")
         self.lbl_type = QtWidgets.QLabel("—")
         info_lay.addRow("Fotoğraf:", self.lbl_img)
-        info_lay.addRow("JSON Türü:", self.lbl_type)
+        info_lay.addRow("JSON Türleri:", self.lbl_type)
+        self.lbl_status = QtWidgets.QLabel("—")
+        info_lay.addRow("Durum:", self.lbl_status)
+        self.progress = QtWidgets.QProgressBar()
+        self.progress.setRange(0, 0)  # belirsiz (meşgul) gösterim
+        self.progress.setTextVisible(False)
+        self.progress.setVisible(False)
+        info_lay.addRow(self.progress)
         right.addWidget(self.grp_info)
 
+        # --- Toplu gezinme (klasör + JSON modu) ---
+        self.grp_nav = QtWidgets.QGroupBox("Gezinme")
+        nav_lay = QtWidgets.QHBoxLayout(self.grp_nav)
+        self.btn_prev = QtWidgets.QPushButton("◀ Önceki")
+        self.btn_next = QtWidgets.QPushButton("Sonraki ▶")
+        self.lbl_nav = QtWidgets.QLabel("—")
+        self.lbl_nav.setAlignment(QtCore.Qt.AlignCenter)
+        nav_lay.addWidget(self.btn_prev)
+        nav_lay.addWidget(self.lbl_nav, 1)
+        nav_lay.addWidget(self.btn_next)
+        self.btn_prev.clicked.connect(self.prev_case)
+        self.btn_next.clicked.connect(self.next_case)
+        self.btn_prev.setToolTip("Önceki vaka (PageUp)")
+        self.btn_next.setToolTip("Sonraki vaka (PageDown)")
+        right.addWidget(self.grp_nav)
+
+        # Ok tuşları görünümde kaydırmaya kalır; kısayollar sadece toplu gezinmede açıktır
+        self._nav_shortcuts = []
+        for key, slot in [(QtCore.Qt.Key_PageDown, self.next_case), (QtCore.Qt.Key_PageUp, self.prev_case)]:
+            sc = QtGui.QShortcut(QtGui.QKeySequence(key), self)
+            sc.activated.connect(slot)
+            self._nav_shortcuts.append(sc)
+        self._set_nav_visible(False)
+
+        # --- İmleç altındaki / seçili anotasyon ---
+        self.grp_details = QtWidgets.QGroupBox("Anotasyon")
+        det_lay = QtWidgets.QFormLayout(self.grp_details)
+        self.lbl_det_quad = QtWidgets.QLabel("—")
+        self.lbl_det_tooth = QtWidgets.QLabel("—")
+        self.lbl_det_disease = QtWidgets.QLabel("—")
+        self.lbl_det_area = QtWidgets.QLabel("—")
+        det_lay.addRow("Quadrant:", self.lbl_det_quad)
+        det_lay.addRow("Diş:", self.lbl_det_tooth)
+        det_lay.addRow("Hastalık:", self.lbl_det_disease)
+        det_lay.addRow("Alan:", self.lbl_det_area)
+        right.addWidget(self.grp_details)
+
         # --- Checkbox Paneli ---
         self.grp_controls = QtWidgets.QGroupBox("Görüntü Seçenekleri")
         self.controls_layout = QtWidgets.QVBoxLayout(self.grp_controls)
         right.addWidget(self.grp_controls)
 
+        # --- Performans (hata ayıklama paneli; F12 ile açılır/kapanır) ---
+        self.grp_perf = QtWidgets.QGroupBox("Performans")
+        perf_lay = QtWidgets.QVBoxLayout(self.grp_perf)
+        self.tbl_perf = QtWidgets.QTableWidget(0, 2)
+        self.tbl_perf.setHorizontalHeaderLabels(["Aşama", "ms"])
+        self.tbl_perf.horizontalHeader().setSectionResizeMode(0, QtWidgets.QHeaderView.Stretch)
+        self.tbl_perf.verticalHeader().setVisible(False)
+        self.tbl_perf.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.tbl_perf.setMinimumHeight(160)
+        self.lbl_perf = QtWidgets.QLabel("—")
+        self.lbl_perf.setWordWrap(True)
+        btn_export_json = QtWidgets.QPushButton("JSON Dışa Aktar")
+        btn_export_csv = QtWidgets.QPushButton("CSV Dışa Aktar")
+        btn_export_json.clicked.connect(lambda: self.export_perf("json"))
+        btn_export_csv.clicked.connect(lambda: self.export_perf("csv"))
+        export_row = QtWidgets.QHBoxLayout()
+        export_row.addWidget(btn_export_json)
+        export_row.addWidget(btn_export_csv)
+        perf_lay.addWidget(self.tbl_perf)
+        perf_lay.addWidget(self.lbl_perf)
+        perf_lay.addLayout(export_row)
+        self.grp_perf.setVisible(False)
+        right.addWidget(self.grp_perf)
+
+        self.btn_perf = QtWidgets.QPushButton("Performans (F12)")
+        self.btn_perf.setCheckable(True)
+        self.btn_perf.toggled.connect(self.set_perf_visible)
+        sc = QtGui.QShortcut(QtGui.QKeySequence(QtCore.Qt.Key_F12), self)
+        sc.activated.connect(self.btn_perf.toggle)
+        self._perf_timer = QtCore.QTimer(self)
+        self._perf_timer.setSingleShot(True)
+        self._perf_timer.setInterval(PERF_REFRESH_MS)
+        self._perf_timer.timeout.connect(self.refresh_perf)
+
         right.addStretch(1)
+        right.addWidget(self.btn_perf)
 
         right_wrap = QtWidgets.QWidget()
         right_wrap.setLayout(right)
@@ -77,15 +241,38 @@ class ViewerPage(QtWidgets.QWidget):
         root.addWidget(right_wrap)
 
         
-        self._json_data = None
-        self._items = []  # sahneye eklenen overlay öğeleri (bbox, polygon, label)
-
-        # Checkbox’ları oluştur
+        # DatasetGroup: seçilen JSON'lar (tip başına bir AnnotationDataset, JSON başına bir kez kurulur)
+        self._datasets = None
+        self._layers = {}  # o anki vakanın katmanları: anahtar -> LayerItem (tembel kurulur)
+        # image_path -> (veri setleri, görselin veri sürümü, katman sözlüğü);
+        # sahnede olmayan gruplar da burada yaşar
+        self._overlay_cache = OrderedDict()
+        self._task = None        # devam eden CaseLoadTask
+        self._load_token = 0     # her load_case'de artar; eski sonuçlar yok sayılır
+        self._shown_image = None  # sahnedeki ImagePyramid (yarım yüklemede aynı vaka yenilenir)
+
+        # İsabet testi: o anki görselin veri seti başına ızgara indeksi (tembel kurulur)
+        # ve vurgu öğeleri. İsabet (indeks sırası, anotasyon indeksi) çiftidir.
+        self._hit_indexes = None
+        self._hovered = None    # imlecin altındaki anotasyon
+        self._selected = None   # tıklanarak seçilen anotasyon
+        self._hover_item = None
+        self._select_item = None
+
+        # Toplu gezinme durumu
+        self._cases = []                 # görsel yolları (JSON images sırasıyla)
+        self._case_index = -1
+        self._batch_dir = None
+        self._batch_jsons = None
+        self._batch_datasets = None
+        self._image_cache = ImageCache()
+        self._prefetch_tasks = {}        # image_path -> ImageDecodeTask
+        self._overlay_queue = []         # katmanı önceden kurulacak komşu yollar
+
+        self._layer_opacity = {}  # katman anahtarı -> saydamlık (0..1); yoksa 1
+
+        # Checkbox’ları oluştur (çizim tetikleyicileri de burada bağlanır)
         self.create_checkboxes()
-        # Çizim tetikleyici
-        for cb in [self.cb_quad_bbox, self.cb_quad_mask, self.cb_teeth_bbox,
-                   self.cb_teeth_mask, self.cb_disease_mask, self.cb_disease_bbox, self.cb_text]:
-            cb.stateChanged.connect(self.on_checkbox_changed)
 
     def create_checkboxes(self):
         """Tüm checkbox butonları oluşturulur."""
@@ -97,345 +284,551 @@ class ViewerPage(QtWidgets.QWidget):
         self.cb_disease_bbox = QtWidgets.QCheckBox("Disease BBox")
         self.cb_text = QtWidgets.QCheckBox("Text Labels")
 
+        # Maske katmanlarının saydamlık ayarı (bitmap yeniden çizilmez, sadece karışım oranı değişir)
+        self.sl_quad_mask = self._opacity_slider("quad_mask")
+        self.sl_teeth_mask = self._opacity_slider("teeth_mask")
+        self.sl_disease_mask = self._opacity_slider("dis_mask")
+
         # Checkbox’ları panele ekle
         self.controls_layout.addWidget(self.cb_quad_bbox)
-        self.controls_layout.addWidget(self.cb_quad_mask)
+        self.controls_layout.addLayout(self._with_slider(self.cb_quad_mask, self.sl_quad_mask))
         self.controls_layout.addWidget(self.cb_teeth_bbox)
-        self.controls_layout.addWidget(self.cb_teeth_mask)
-        self.controls_layout.addWidget(self.cb_disease_mask)
+        self.controls_layout.addLayout(self._with_slider(self.cb_teeth_mask, self.sl_teeth_mask))
+        self.controls_layout.addLayout(self._with_slider(self.cb_disease_mask, self.sl_disease_mask))
         self.controls_layout.addWidget(self.cb_disease_bbox)
         self.controls_layout.addWidget(self.cb_text)
         self.controls_layout.addStretch(1)
 
-        # Checkbox değişiminde yeniden çizim olacak (şimdilik pasif)
+        # Checkbox değişiminde ilgili katman gösterilir/gizlenir
         for cb in [self.cb_quad_bbox, self.cb_quad_mask, self.cb_teeth_bbox,
                    self.cb_teeth_mask, self.cb_disease_mask, self.cb_disease_bbox, self.cb_text]:
             cb.stateChanged.connect(self.on_checkbox_changed)
 
+    def _opacity_slider(self, key: str):
+        slider = QtWidgets.QSlider(QtCore.Qt.Horizontal)
+        slider.setRange(0, 100)
+        slider.setValue(100)
+        slider.setFixedWidth(90)
+        slider.setToolTip("Katman saydamlığı")
+        slider.valueChanged.connect(lambda value, k=key: self._set_layer_opacity(k, value / 100.0))
+        return slider
+
+    @staticmethod
+    def _with_slider(cb, slider):
+        row = QtWidgets.QHBoxLayout()
+        row.addWidget(cb, 1)
+        row.addWidget(slider)
+        return row
+
+    def _set_layer_opacity(self, key: str, opacity: float):
+        self._layer_opacity[key] = opacity
+        layer = self._layers.get(key)
+        if layer is not None:
+            layer.setOpacity(opacity)
+
     def set_checkbox_states(self):
-        """JSON tipine göre checkbox aktif/pasif yapılır."""
-        if self.json_type == "Quadrant":
-            self.cb_quad_bbox.setEnabled(True)
-            self.cb_quad_mask.setEnabled(True)
-            self.cb_teeth_bbox.setEnabled(False)
-            self.cb_teeth_mask.setEnabled(False)
-            self.cb_disease_mask.setEnabled(False)
-            self.cb_disease_bbox.setEnabled(False)
-            self.cb_text.setEnabled(True)
-
-        elif self.json_type == "Enumeration":
-            self.cb_quad_bbox.setEnabled(False)
-            self.cb_quad_mask.setEnabled(False)
-            self.cb_teeth_bbox.setEnabled(True)
-            self.cb_teeth_mask.setEnabled(True)
-            self.cb_disease_mask.setEnabled(False)
-            self.cb_disease_bbox.setEnabled(False)
-            self.cb_text.setEnabled(True)
-
-        elif self.json_type == "Disease":
-            self.cb_quad_bbox.setEnabled(False)
-            self.cb_quad_mask.setEnabled(False)
-            self.cb_teeth_bbox.setEnabled(False)
-            self.cb_teeth_mask.setEnabled(False)
-            self.cb_disease_mask.setEnabled(True)
-            self.cb_disease_bbox.setEnabled(True)
-            self.cb_text.setEnabled(True)
-
-    def load_case(self, image_path: str, json_path: str, json_type: str):
-        """LoaderPage'den gelen veriyi alır."""
-        self.image_path = image_path
-        self.json_type = json_type
+        """Yüklü JSON tiplerine göre checkbox aktif/pasif yapılır (birden çok tip birlikte açılabilir)."""
+        for key, cb in self._layer_checkboxes().items():
+            cb.setEnabled(LAYERS[key][0] in (None, *self.json_types))
+
+    def load_case(self, image_path: str, json_paths):
+        """Tek vakayı arka planda yükler (toplu gezinme modundan çıkar).
+
+        ``json_paths`` tek yol ya da yol listesi (örn. Quadrant + Enumeration + Disease).
+        """
+        self._stop_batch()
+        self._open_case(image_path, json_paths)
+
+    def load_batch(self, images_dir: str, json_paths):
+        """Klasör + JSON modu: JSON'lardaki tüm görseller arasında ileri/geri gezinilir."""
+        self._stop_batch()
+        self._batch_jsons = json_paths
+        self._batch_dir = images_dir
+        self._start_task(CaseLoadTask(self._load_token + 1, None, json_paths), self._on_batch_loaded)
+
+    def _open_case(self, image_path: str, json_paths):
+        task = CaseLoadTask(self._load_token + 1, image_path, json_paths)
+        task.signals.partial.connect(self._on_case_partial)
+        self._start_task(task, self._on_case_loaded)
+
+    def _start_task(self, task, on_loaded):
+        """Devam eden yüklemeyi iptal eder ve yenisini thread havuzunda başlatır."""
+        if self._task is not None:
+            self._task.cancel()
+        self._load_token = task.token
+        task.signals.progress.connect(self._on_load_progress)
+        task.signals.loaded.connect(on_loaded)
+        task.signals.failed.connect(self._on_load_failed)
+        self._task = task
+        # Kayıt görev başlamadan açılır; arka plan aşamaları aynı token'a yazılır
+        recorder.begin(task.token, task.image_path, task.json_paths)
+        self._set_busy(True, "Yükleniyor…")
+        QtCore.QThreadPool.globalInstance().start(task)
 
-        ok = self.view.load_image(self.image_path)
-        if not ok:
-            QtWidgets.QMessageBox.warning(self, "Hata", "Görsel yüklenemedi.")
+    # ----------------------
+    # TOPLU GEZİNME
+    # ----------------------
+    def _stop_batch(self):
+        for task in self._prefetch_tasks.values():
+            task.cancel()
+        self._prefetch_tasks.clear()
+        self._overlay_queue.clear()
+        self._cases = []
+        self._case_index = -1
+        self._batch_jsons = None
+        self._batch_datasets = None
+        self._set_nav_visible(False)
+
+    def _on_batch_loaded(self, token: int, _image_path: str, _image, datasets):
+        if token != self._load_token:
+            return
+        self._task = None
+        self._set_busy(False)
+        # Klasör bir kez listelenir; JSON'da olup diskte olmayan görseller atlanır
+        try:
+            on_disk = set(os.listdir(self._batch_dir))
+        except OSError as e:
+            QtWidgets.QMessageBox.warning(self, "Hata", f"Klasör okunamadı:\n{e}")
+            return
+        self._batch_datasets = datasets
+        self._cases = [os.path.join(self._batch_dir, fn) for fn in datasets.file_names if fn in on_disk]
+        if not self._cases:
+            QtWidgets.QMessageBox.warning(self, "Uyarı", "Klasörde JSON'daki görsellerden hiçbiri bulunamadı.")
+            return
+        self._set_nav_visible(True)
+        self.show_case(0)
+
+    def _set_nav_visible(self, visible: bool):
+        """Gezinme kutusunu ve PageUp/PageDown kısayollarını birlikte açar/kapatır."""
+        self.grp_nav.setVisible(visible)
+        for sc in self._nav_shortcuts:
+            sc.setEnabled(visible)
+
+    def show_case(self, index: int):
+        """Toplu listedeki vakayı gösterir; önceden çözülmüşse hiç beklemeden."""
+        if not (0 <= index < len(self._cases)):
             return
+        self._case_index = index
+        self.lbl_nav.setText(f"{index + 1} / {len(self._cases)}")
+        path = self._cases[index]
+        image = self._image_cache.get(path)
+        if image is not None and self._batch_datasets is not None:
+            if self._task is not None:
+                self._task.cancel()
+                self._task = None
+            self._load_token += 1
+            recorder.begin(self._load_token, path, self._batch_json_paths())
+            self._on_case_loaded(self._load_token, path, image, self._batch_datasets)
+        else:
+            self._open_case(path, self._batch_jsons)
+
+    def next_case(self):
+        if self._cases:
+            self.show_case(self._case_index + 1)
+
+    def prev_case(self):
+        if self._cases:
+            self.show_case(self._case_index - 1)
+
+    def _neighbor_paths(self):
+        """O anki vakanın komşuları, yakından uzağa (sonraki önce)."""
+        out = []
+        for d in range(1, PREFETCH_RADIUS + 1):
+            for j in (self._case_index + d, self._case_index - d):
+                if 0 <= j < len(self._cases):
+                    out.append(self._cases[j])
+        return out
 
-        self.lbl_img.setText(os.path.basename(self.image_path))
-        self.lbl_type.setText(self.json_type)
-        self.set_checkbox_states()
-        
-        self._current_image_id = self._find_image_id_from_filename(self.image_path)
-        if self._current_image_id is None:
-            QtWidgets.QMessageBox.warning(self, "Uyarı", "image_id bulunamadı, tüm anotasyonlar çizilebilir!")
+    def _prefetch_neighbors(self):
+        """Komşu görselleri arka planda çözer, katmanlarını boşta kalınca kurar."""
+        if not self._cases:
+            return
+        neighbors = self._neighbor_paths()
+        # Pencereden çıkan çözme görevlerini iptal et
+        for path in [p for p in self._prefetch_tasks if p not in neighbors]:
+            self._prefetch_tasks.pop(path).cancel()
+        for path in neighbors:
+            if path in self._image_cache or path in self._prefetch_tasks:
+                continue
+            task = ImageDecodeTask(path)
+            task.signals.decoded.connect(self._on_prefetch_decoded)
+            self._prefetch_tasks[path] = task
+            QtCore.QThreadPool.globalInstance().start(task)
 
+        self._overlay_queue = list(neighbors)
+        QtCore.QTimer.singleShot(0, self._prebuild_next_overlay)
 
-    def on_checkbox_changed(self):
-        """Checkbox değişikliklerinde çalışacak (çizim motoru bağlanacak)."""
-        pass  # Daha sonra buraya Drow fonksiyonlarını ekleyeceğiz
-    def load_case(self, image_path: str, json_path: str, json_type: str):
-        """LoaderPage'den gelen veriyi alır, resmi açar, JSON'u yükler ve çizer."""
-        self.image_path = image_path
-        self.json_type = json_type
+    def _on_prefetch_decoded(self, image_path: str, image):
+        if self._prefetch_tasks.pop(image_path, None) is not None:
+            self._image_cache.put(image_path, image)
+
+    def _prebuild_next_overlay(self):
+        """Kuyruktaki bir komşunun seçili katmanlarını kurar (olay döngüsünü bloklamamak için teker teker)."""
+        if not self._overlay_queue or self._batch_datasets is None:
+            return
+        path = self._overlay_queue.pop(0)
+        datasets = self._batch_datasets
+        layers = self._overlays_for(datasets, path, touch=False)
+        for key in self._wanted_layers(datasets.json_types):
+            if key not in layers:
+                layers[key] = self._build_layer(datasets, key, path)
+            # Vaka sığdırılmış açılır: tüm kutular görünecek
+            layers[key].prepare()
+        self._trim_overlay_cache()
+        if self._overlay_queue:
+            QtCore.QTimer.singleShot(0, self._prebuild_next_overlay)
+
+    def _overlays_for(self, datasets, image_path: str, touch=True):
+        """Vakanın katman sözlüğünü önbellekten döner (yoksa boş olarak açar)."""
+        # Veri seti hâlâ okunuyorsa görselin yeni anotasyonları gelmiş olabilir; JSON
+        # seçimi değişse de aynı veri setleri (önbellekten) gelirse katmanlar yeniden kullanılır
+        revision = datasets.revision_for(image_path)
+        entry = self._overlay_cache.get(image_path)
+        if entry is None or entry[0] != datasets.datasets or entry[1] != revision:
+            entry = self._overlay_cache[image_path] = (datasets.datasets, revision, {})
+        if touch:
+            self._overlay_cache.move_to_end(image_path)
+        self._trim_overlay_cache()
+        return entry[2]
+
+    def _trim_overlay_cache(self):
+        """Katman önbelleğini vaka sayısı ve bayt sınırına indirir (en eski vakalardan).
+
+        Katmanlar tembel kurulup çizildikçe büyüdüğü için boyları her kırpmada
+        yeniden toplanır. Sahnedeki vaka atılmaz.
+        """
+        sizes = {path: sum(layer.sizeInBytes() for layer in entry[2].values())
+                 for path, entry in self._overlay_cache.items()}
+        total = sum(sizes.values())
+        for path in list(self._overlay_cache):
+            if len(self._overlay_cache) <= OVERLAY_CACHE_SIZE and total <= OVERLAY_CACHE_BYTES:
+                break
+            if path == self.image_path:
+                continue
+            del self._overlay_cache[path]
+            total -= sizes[path]
+
+    def _set_busy(self, busy: bool, text: str = "Hazır"):
+        self.progress.setVisible(busy)
+        self.lbl_status.setText(text)
 
-        ok = self.view.load_image(self.image_path)
-        if not ok:
+    def _on_load_progress(self, token: int, text: str):
+        if token == self._load_token:
+            self.lbl_status.setText(text)
+
+    def _on_load_failed(self, token: int, title: str, message: str):
+        if token != self._load_token:
+            return
+        self._task = None
+        self._set_busy(False, "Hata")
+        QtWidgets.QMessageBox.warning(self, title, message)
+
+    def _on_case_partial(self, token: int, image_path: str, image, datasets):
+        """JSON okunurken: görseli ve o ana kadar okunan anotasyonları göster."""
+        if token != self._load_token:
+            return
+        if self._show_case(image_path, image, datasets):
+            self.lbl_status.setText("Anotasyonlar okunuyor…")
+
+    def _on_case_loaded(self, token: int, image_path: str, image, datasets):
+        """Arka plan yüklemesi bitti: görseli sahneye koy ve katmanları çiz."""
+        if token != self._load_token:
+            return  # bu arada başka vaka seçildi
+        self._task = None
+        if not self._show_case(image_path, image, datasets):
+            self._set_busy(False, "Hata")
             QtWidgets.QMessageBox.warning(self, "Hata", "Görsel yüklenemedi.")
             return
+        self._set_busy(False)
+        recorder.set(token, items=len(self.view.scene().items()), rss_bytes=current_rss_bytes())
+        self._perf_timer.start()
+
+        if self._cases:
+            self._prefetch_neighbors()
+
+    def _show_case(self, image_path: str, image, datasets):
+        """Vakayı sahneye koyar; aynı görsel zaten gösteriliyorsa sadece katmanları yeniler."""
+        if image is not self._shown_image:
+            # Önceki vakanın katmanları sahneden alınır (önbellekte kalır); sahne set_image'da temizlenir
+            self.clear_overlays()
+            self._clear_hits()
+            self._image_cache.put(image_path, image)
+            with recorder.phase(self._load_token, "show_image"):
+                shown = self.view.set_image(image)
+            if not shown:
+                self._shown_image = None
+                return False
+            self._shown_image = image
+        self.image_path = image_path
+        self.json_types = datasets.json_types
 
         # Sadece dosya adı göster
         self.lbl_img.setText(os.path.basename(self.image_path))
-        self.lbl_type.setText(self.json_type)
-
-        # JSON'u belleğe al (UI'da yolu göstermiyoruz)
-        self._json_data = self._load_json(json_path)
+        self.lbl_type.setText(" + ".join(self.json_types) or "—")
+
+        # Veri setleri bir kez ayrıştırılıp indekslendi (AnnotationDataset, paylaşılan önbellek);
+        # görsel her birinde dosya adıyla bulunur
+        self._datasets = datasets
+        layers = self._overlays_for(datasets, image_path)
+        if layers is not self._layers:
+            # Veri değişti (yeni vaka ya da yarım yüklemede yeni anotasyonlar): indeks de yenilenir
+            self.clear_overlays()
+            self._clear_hits()
+            self._layers = layers
 
         # Checkbox durumlarını ayarla ve çiz
         self.set_checkbox_states()
-        self.draw_all()
-
-    def _load_json(self, path: str):
-        try:
-            with open(path, "r") as f:
-                data = json.load(f)
-            return data
-        except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "JSON Hatası", f"JSON okunamadı:\n{e}")
-            return None
+        with recorder.phase(self._load_token, "draw_all"):
+            self.draw_all()
+        return True
 
     def on_checkbox_changed(self):
         self.draw_all()
+        if self._cases:
+            # Yeni açılan katman komşular için de önceden kurulsun
+            self._overlay_queue = self._neighbor_paths()
+            QtCore.QTimer.singleShot(0, self._prebuild_next_overlay)
+
+    def _schedule_release(self):
+        """Görünüm değişti: bırakılacak maske yolu tutan katman varsa bırakmayı zamanla."""
+        if any(layer.holds_paths() for layer in self._layers.values()):
+            self._release_timer.start()
+
+    def _release_offscreen_overlays(self):
+        """Sahnedeki katmanların görünür alandan uzak kutularını bırakır (yeniden görününce kurulur)."""
+        if self.view._pix_item is None:
+            return
+        rect = self.view.visible_scene_rect()
+        mx, my = rect.width() * RELEASE_MARGIN, rect.height() * RELEASE_MARGIN
+        keep = rect.adjusted(-mx, -my, mx, my)
+        scale = self.view.transform().m11()
+        for layer in self._layers.values():
+            if layer.holds_paths():
+                layer.release_outside(keep, scale)
 
     def clear_overlays(self):
-        """Önceki çizimleri sahneden temizle."""
+        """O anki vakanın katmanlarını sahneden kaldırır (vaka önbelleğinde kalırlar)."""
         if not self.view.scene():
             return
-        for it in self._items:
-            self.view.scene().removeItem(it)
-        self._items.clear()
-    
-    def _find_image_id_from_filename(self, filename):
-        #JSON içindeki images bölümünden, eşleşen file_name'e göre image_id bulur.
-        if self._json_data is None:
-            return None
-
-        images = self._json_data.get("images", [])
-        base_name = os.path.basename(filename)
-
-        for img in images:
-            if img.get("file_name") == base_name:
-                return img.get("id")
-
-        return None
+        for layer in self._layers.values():
+            if layer.scene() is not None:
+                self.view.scene().removeItem(layer)
+            # Önbellekteki vaka tekrar sığdırılmış açılır (bitmap); vektör yollar tutulmaz
+            layer.release_outside(QtCore.QRectF())
+        self._layers = {}
+
+    def drop_cached_layers(self):
+        """Tüm vakaların kurulmuş katmanlarını atar; sonraki draw_all baştan kurar (örn. ölçüm için)."""
+        self.clear_overlays()
+        self._overlay_cache.clear()
+        if self._datasets is not None:
+            self._layers = self._overlays_for(self._datasets, self.image_path)
 
     # ----------------------
-    # ANA ÇİZİM YÜRÜTÜCÜSÜ
+    # İSABET TESTİ / VURGU
     # ----------------------
-    def draw_all(self):
-        current_id = self._find_image_id_from_filename(self.image_path)
-        
-        """Seçili checkbox'lara ve JSON tipine göre her şeyi yeniden çizer."""
-        if self._json_data is None or self.view._pix_item is None:
-            return
+    def _annotation_indexes(self):
+        """O anki görselin yüklü her veri seti için ızgara indeksi (ilk fare hareketinde kurulur).
+
+        En ayrıntılı tipten başlayarak sıralıdır (hastalık > diş > quadrant).
+        """
+        if self._hit_indexes is None and self._datasets is not None:
+            self._hit_indexes = [AnnotationIndex(self._datasets.annotations_for(t, self.image_path),
+                                                 self._datasets.geometry_for(t, self.image_path))
+                                 for t in reversed(self._datasets.json_types)]
+        return self._hit_indexes or []
+
+    def _hit_at(self, x: float, y: float):
+        """Noktadaki anotasyon: en ayrıntılı tipte isabet yoksa daha az ayrıntılı tipe bakılır."""
+        for k, index in enumerate(self._annotation_indexes()):
+            i = index.at(x, y)
+            if i is not None:
+                return k, i
+        return None
 
-        self.clear_overlays()
+    def _hit_annotation(self, hit):
+        k, i = hit
+        return self._hit_indexes[k].anns[i]
+
+    def _on_view_hovered(self, x: float, y: float):
+        self._set_hovered(self._hit_at(x, y))
+
+    def _on_view_clicked(self, x: float, y: float):
+        hit = self._hit_at(x, y)
+        self._selected = hit
+        self._select_item = self._update_highlight(self._select_item, hit, SELECT_PEN, 21)
+        self._show_details()
+
+    def _set_hovered(self, hit):
+        if hit == self._hovered:
+            return  # aynı anotasyon: sahneye dokunma
+        self._hovered = hit
+        self._hover_item = self._update_highlight(self._hover_item, hit, HOVER_PEN, 20)
+        self._show_details()
+
+    def _update_highlight(self, item, hit, pen_spec, z):
+        """Vurgu öğesini anotasyonun şekline taşır (yoksa kurar, hit None ise gizler)."""
+        if hit is None:
+            if item is not None:
+                item.setVisible(False)
+            return item
+        if item is None:
+            color, width = pen_spec
+            pen = QtGui.QPen(color, width)
+            pen.setCosmetic(True)  # yakınlaştırmadan bağımsız kalınlık
+            item = QtWidgets.QGraphicsPathItem()
+            item.setPen(pen)
+            item.setZValue(z)
+            item.setAcceptedMouseButtons(QtCore.Qt.NoButton)
+            self.view.scene().addItem(item)
+        a = self._hit_annotation(hit)
+        if a.rings:
+            path = rings_to_path(a.rings)
+        else:
+            path = QtGui.QPainterPath()
+            path.addRect(QtCore.QRectF(*a.bbox))
+        item.setPath(path)
+        item.setVisible(True)
+        return item
 
-        anns = self._json_data.get("annotations", [])
-        # Kategori ad sözlükleri (id->isim)
-        cat = self._index_categories(self._json_data)
+    def _show_details(self):
+        """Seçili (yoksa imleç altındaki) anotasyonun bilgilerini panele yazar."""
+        hit = self._selected if self._selected is not None else self._hovered
+        if hit is None or self._hit_indexes is None:
+            for lbl in (self.lbl_det_quad, self.lbl_det_tooth, self.lbl_det_disease, self.lbl_det_area):
+                lbl.setText("—")
+            return
+        a = self._hit_annotation(hit)
+        area = a.area
+        if not area and a.bbox:
+            area = a.bbox[2] * a.bbox[3]
+        self.lbl_det_quad.setText(str(a.q_name) if a.q_name is not None else "—")
+        self.lbl_det_tooth.setText(str(a.t_name) if a.t_name is not None else "—")
+        self.lbl_det_disease.setText(str(a.d_name) if a.d_name is not None else "—")
+        self.lbl_det_area.setText(f"{area:,.0f} px²")
+
+    def _clear_hits(self):
+        """İndeksi ve vurguları bırakır (vaka ya da verisi değişti)."""
+        for item in (self._hover_item, self._select_item):
+            if item is not None and item.scene() is not None:
+                item.scene().removeItem(item)
+        self._hover_item = self._select_item = None
+        self._hit_indexes = None
+        self._hovered = self._selected = None
+        self._show_details()
 
-        # Hızlı erişim için: hastalık id->renk
-        disease_colors = self._disease_color_map(cat.get("categories_3", {}))
+    # ----------------------
+    # ANA ÇİZİM YÜRÜTÜCÜSÜ
+    # ----------------------
+    def _layer_checkboxes(self):
+        """Katman anahtarı -> onu açan checkbox."""
+        return {
+            "quad_bbox": self.cb_quad_bbox,
+            "quad_mask": self.cb_quad_mask,
+            "teeth_bbox": self.cb_teeth_bbox,
+            "teeth_mask": self.cb_teeth_mask,
+            "dis_bbox": self.cb_disease_bbox,
+            "dis_mask": self.cb_disease_mask,
+            "text": self.cb_text,
+        }
 
-        # Hangi katmanda ne çizileceğine karar verelim
-        draw_quad_bbox   = self.cb_quad_bbox.isChecked()   and self.json_type == "Quadrant"
-        draw_quad_mask   = self.cb_quad_mask.isChecked()   and self.json_type == "Quadrant"
-        draw_teeth_bbox  = self.cb_teeth_bbox.isChecked()  and self.json_type == "Enumeration"
-        draw_teeth_mask  = self.cb_teeth_mask.isChecked()  and self.json_type == "Enumeration"
-        draw_dis_mask    = self.cb_disease_mask.isChecked() and self.json_type == "Disease"
-        draw_dis_bbox    = self.cb_disease_bbox.isChecked() and self.json_type == "Disease"
-        draw_text        = self.cb_text.isChecked()
+    def draw_all(self):
+        """Seçili checkbox'lara göre katmanları gösterir/gizler.
 
-        for a in anns:
-            if a.get("image_id") != current_id:
+        Her katman ilk gösterildiğinde bir kez kurulur; sonraki geçişlerde
+        sadece görünürlüğü değişir.
+        """
+        if self._datasets is None or self.view._pix_item is None:
+            return
+        with profiled("draw_all"):
+            self._apply_layers()
+
+    def _apply_layers(self):
+        wanted_keys = self._wanted_layers(self.json_types)
+        for key in LAYERS:
+            wanted = key in wanted_keys
+            layer = self._layers.get(key)
+            if wanted and layer is None:
+                layer = self._layers[key] = self._build_layer(self._datasets, key, self.image_path)
+            if layer is None:
                 continue
-            # Ortak alanlar güvenli şekilde alınır
-            bbox = a.get("bbox")  # [x, y, w, h]
-            segs = a.get("segmentation") or []
-
-            # Etiket parçaları
-            q_id = a.get("category_id") if self.json_type == "Quadrant" else a.get("category_id_1")
-            t_id = a.get("category_id_2")
-            d_id = a.get("category_id_3")
-
-            q_name = cat["categories"].get(q_id) if self.json_type == "Quadrant" else cat["categories_1"].get(q_id)
-            t_name = cat["categories_2"].get(t_id) if t_id is not None else None
-            d_name = cat["categories_3"].get(d_id) if d_id is not None else None
-
-            # 1) QUADRANT: bbox/mask
-            if self.json_type == "Quadrant":
-                if draw_quad_bbox and bbox:
-                    self._items.append(self.draw_bbox(bbox, pen=QtGui.QPen(QtGui.QColor(220, 0, 0), 2.0)))
-                if draw_quad_mask and segs:
-                    self._items.extend(self.draw_polygons(segs, fill=QtGui.QColor(220, 0, 0, 70),
-                                                          outline=QtGui.QColor(220, 0, 0), outline_w=1.5))
-
-            # 2) ENUMERATION: diş bbox/mask
-            elif self.json_type == "Enumeration":
-                if draw_teeth_bbox and bbox:
-                    self._items.append(self.draw_bbox(bbox, pen=QtGui.QPen(QtGui.QColor(220, 0, 0), 2.0)))
-                if draw_teeth_mask and segs:
-                    self._items.extend(self.draw_polygons(segs, fill=QtGui.QColor(0, 140, 255, 70),
-                                                          outline=QtGui.QColor(0, 140, 255), outline_w=1.5))
-
-            # 3) DISEASE: sadece hastalıklı dişler var → disease bbox/mask
-            elif self.json_type == "Disease":
-                color = disease_colors.get(d_id, QtGui.QColor(240, 180, 0))  # fallback
-                if draw_dis_bbox and bbox:
-                    pen = QtGui.QPen(color, 2.0)
-                    self._items.append(self.draw_bbox(bbox, pen=pen))
-                if draw_dis_mask and segs:
-                    fill = QtGui.QColor(color.red(), color.green(), color.blue(), 70)
-                    self._items.extend(self.draw_polygons(segs, fill=fill, outline=color, outline_w=1.5))
-
-            # 4) TEXT LABELS (kısa format A)
-            if draw_text:
-                label = self._build_short_label(self.json_type, q_name, t_name, d_name)
-                if label:
-                    # Yazıyı bbox üstüne, yoksa polygon centroid'ine koy
-                    pos = None
-                    if bbox:
-                        x, y, w, h = bbox
-                        pos = QtCore.QPointF(x, y - 4)  # kutunun üstüne koy
-                    elif segs:
-                        pos = self._polygon_centroid(segs[0])  # ilk halkadan centroid
-                    if pos:
-                        self._items.append(self.draw_label(label, pos))
+            if wanted and layer.scene() is None:
+                self.view.scene().addItem(layer)
+            layer.setOpacity(self._layer_opacity.get(key, 1.0))
+            layer.setVisible(wanted)
 
         # Görseli kadraja iyi sığdırmak için (isteğe bağlı)
         # self.view.fitInView(self.view.sceneRect(), QtCore.Qt.KeepAspectRatio)
 
-    # ----------------------
-    # YARDIMCI: KATEGORİ İNDEKSLERİ
-    # ----------------------
-    def _index_categories(self, data):
-        """categories / categories_1 / categories_2 / categories_3 -> {id: name} sözlükleri döner."""
-        out = {
-            "categories": {},
-            "categories_1": {},
-            "categories_2": {},
-            "categories_3": {},
-        }
-        if "categories" in data:
-            for c in data["categories"]:
-                out["categories"][c.get("id")] = c.get("name")
-        if "categories_1" in data:
-            for c in data["categories_1"]:
-                out["categories_1"][c.get("id")] = c.get("name")
-        if "categories_2" in data:
-            for c in data["categories_2"]:
-                out["categories_2"][c.get("id")] = c.get("name")
-        if "categories_3" in data:
-            for c in data["categories_3"]:
-                out["categories_3"][c.get("id")] = c.get("name")
-        return out
+    def _build_layer(self, datasets, key: str, image_path: str):
+        """Katmanı kendi tipindeki veri setinin (sadece o görsele ait) anotasyonlarından kurar.
 
-    def _disease_color_map(self, id2name: dict):
-        """Hastalık adlarına göre tutarlı renk seç (4 hastalık varsayımıyla)."""
-        palette = [
-            QtGui.QColor(220, 20, 60),   # crimson
-            QtGui.QColor(65, 105, 225),  # royal blue
-            QtGui.QColor(50, 205, 50),   # lime green
-            QtGui.QColor(255, 140, 0),   # dark orange
-        ]
-        mapping = {}
-        for i, k in enumerate(sorted(id2name.keys(), key=lambda x: int(x) if isinstance(x, int) else 0)):
-            mapping[k] = palette[i % len(palette)]
-        return mapping
+        Yazı katmanı yüklü tüm veri setlerinden kurulur (bkz. build_text_layer).
+        """
+        if key == "text":
+            return build_text_layer([(t, datasets.annotations_for(t, image_path))
+                                     for t in reversed(datasets.json_types)])
+        dataset = datasets.dataset_for(LAYERS[key][0])
+        anns = datasets.annotations_for(LAYERS[key][0], image_path)
+        return build_layer(key, anns, dataset.json_type if dataset is not None else None)
 
-    # ----------------------
-    # ÇİZİM PRİMİTİFLERİ
-    # ----------------------
-    def draw_bbox(self, bbox, pen=None):
-        """[x,y,w,h] dikdörtgeni çizer."""
-        x, y, w, h = bbox
-        rect = QtCore.QRectF(x, y, w, h)
-        item = self.view.scene().addRect(rect, pen or QtGui.QPen(QtGui.QColor(220, 0, 0), 2.0))
-        item.setZValue(10)
-        return item
-
-    def draw_polygons(self, segmentation, fill: QtGui.QColor, outline: QtGui.QColor, outline_w=1.5):
-        """COCO-style segmentation: [[x1,y1,x2,y2,...], ...]"""
-        items = []
-        for ring in segmentation:
-            pts = self._flat_to_qpolygonf(ring)
-            path = QtGui.QPainterPath()
-            if len(pts) > 0:
-                path.addPolygon(pts)
-                path.closeSubpath()
-            item = self.view.scene().addPath(
-                path,
-                QtGui.QPen(outline, outline_w),
-                QtGui.QBrush(fill)
-            )
-            item.setZValue(8)
-            items.append(item)
-        return items
-
-    def draw_label(self, text: str, pos: QtCore.QPointF):
-        """Kısa metin etiketi (kutu üstü)."""
-        # Arka planlı metin için basit bir TextItem
-        item = QtWidgets.QGraphicsSimpleTextItem(text)
-        font = item.font()
-        font.setPointSizeF(10.0)
-        item.setFont(font)
-        item.setBrush(QtGui.QBrush(QtGui.QColor(0, 0, 0)))  # siyah yazı
-        item.setPos(pos)
-
-        # Beyaz yarı saydam arkaplan
-        pad = 3
-        br = item.boundingRect()
-        bg = self.view.scene().addRect(
-            QtCore.QRectF(pos.x() - pad, pos.y() - pad, br.width() + 2*pad, br.height() + 2*pad),
-            QtGui.QPen(QtCore.Qt.NoPen),
-            QtGui.QBrush(QtGui.QColor(255, 255, 255, 190))
-        )
-        bg.setZValue(11)
-        item.setZValue(12)
-        self.view.scene().addItem(item)
-
-        # Z-order ve gruplama benzeri kontrol için listede ikisini de tut
-        return_group = QtWidgets.QGraphicsItemGroup()
-        self.view.scene().addItem(return_group)
-        return_group.addToGroup(bg)
-        return_group.addToGroup(item)
-        return_group.setZValue(12)
-        return return_group
+    def _wanted_layers(self, json_types):
+        """İşaretli ve yüklü JSON tiplerinden biriyle çizilebilen katman anahtarları."""
+        return {key for key, cb in self._layer_checkboxes().items()
+                if cb.isChecked() and LAYERS[key][0] in (None, *json_types)}
 
     # ----------------------
-    # ETİKET, GEOMETRİ YARDIMCILARI
+    # PERFORMANS PANELİ
     # ----------------------
-    def _flat_to_qpolygonf(self, flat):
-        """[x1,y1,x2,y2,...] -> QPolygonF"""
-        it = iter(flat)
-        pts = [QtCore.QPointF(float(x), float(y)) for x, y in zip(it, it)]
-        poly = QtGui.QPolygonF(pts)
-        return poly
-
-    def _polygon_centroid(self, flat):
-        """Düz liste (x1,y1,...) için centroid hesapla."""
-        it = iter(flat)
-        pts = [(float(x), float(y)) for x, y in zip(it, it)]
-        if not pts:
-            return QtCore.QPointF(0, 0)
-        # basit centroid
-        xs = sum(p[0] for p in pts) / len(pts)
-        ys = sum(p[1] for p in pts) / len(pts)
-        return QtCore.QPointF(xs, ys)
-
-    def _build_short_label(self, json_type, q_name, t_name, d_name):
-        """Kısa format A: Quadrant -> 'Q:1', Enumeration -> 'Q:1 T:3', Disease -> 'Q:1 T:3 D:xyz'."""
-        if json_type == "Quadrant":
-            if q_name: return f"Q:{q_name}"
-        elif json_type == "Enumeration":
-            parts = []
-            if q_name: parts.append(f"Q:{q_name}")
-            if t_name: parts.append(f"T:{t_name}")
-            return " ".join(parts) if parts else ""
-        elif json_type == "Disease":
-            parts = []
-            if q_name: parts.append(f"Q:{q_name}")
-            if t_name: parts.append(f"T:{t_name}")
-            if d_name: parts.append(f"D:{d_name}")
-            return " ".join(parts) if parts else ""
-        return ""    
\ No newline at end of file
+    def _batch_json_paths(self):
+        jsons = self._batch_jsons or []
+        return [jsons] if isinstance(jsons, str) else list(jsons)
+
+    def _on_view_painted(self, ms: float):
+        if self.view._pix_item is not None:
+            recorder.add(self._load_token, "paint", ms)
+            recorder.peak(self._load_token, "paint_max", ms)
+            if self.grp_perf.isVisible() and not self._perf_timer.isActive():
+                self._perf_timer.start()
+
+    def set_perf_visible(self, visible: bool):
+        self.grp_perf.setVisible(visible)
+        if visible:
+            self.refresh_perf()
+
+    def refresh_perf(self):
+        """O anki vakanın kaydını tabloya yazar."""
+        if not self.grp_perf.isVisible():
+            return
+        rec = recorder.get(self._load_token)
+        phases = rec["phases"] if rec else {}
+        self.tbl_perf.setRowCount(len(phases))
+        for row, (name, ms) in enumerate(phases.items()):
+            self.tbl_perf.setItem(row, 0, QtWidgets.QTableWidgetItem(name))
+            cell = QtWidgets.QTableWidgetItem(f"{ms:.1f}")
+            cell.setTextAlignment(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+            self.tbl_perf.setItem(row, 1, cell)
+        if rec is None:
+            self.lbl_perf.setText("—")
+            return
+        mb = 1024 * 1024
+        rss = rec.get("rss_bytes")
+        lines = [f"Sahne öğesi: {rec.get('items', '—')}",
+                 f"Bellek (RSS): {rss / mb:.1f} MB" if rss else "Bellek (RSS): —",
+                 f"JSON: {rec['json_bytes'] / mb:.1f} MB ({len(rec['json'])} dosya)"]
+        self.lbl_perf.setText("\n".join(lines))
+
+    def export_perf(self, fmt: str):
+        """Tüm vaka kayıtlarını JSON ya da CSV olarak kaydeder."""
+        filters = {"json": "JSON (*.json)", "csv": "CSV (*.csv)"}
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Performans Kayıtlarını Kaydet",
+                                                        f"dentex_perf.{fmt}", filters[fmt])
+        if not path:
+            return
+        try:
+            if fmt == "json":
+                recorder.export_json(path)
+            else:
+                recorder.export_csv(path)
+        except OSError as e:
+            QtWidgets.QMessageBox.warning(self, "Hata", f"Dosya yazılamadı:\n{e}")